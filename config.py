@@ -7,6 +7,73 @@ SERVICE_KEY = os.getenv("SERVICE_KEY")
 API_URL = os.getenv("API_URL")
 LLM_API_KEY = os.getenv("LLM_API_KEY")
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY")
+STATIC_API_URL = os.getenv(
+    "STATIC_API_URL",
+    "http://apis.data.go.kr/B552657/ErmctInfoInqireService/getEgytBassInfoInqire"
+)
+
+# 실시간 병상 스냅샷 백그라운드 갱신 대상 (예: "서울특별시:60,경기도:120")
+SNAPSHOT_REGIONS = os.getenv("SNAPSHOT_REGIONS", "서울특별시")
+SNAPSHOT_REFRESH_SEC = float(os.getenv("SNAPSHOT_REFRESH_SEC", "60"))
+
+# 위경도 → 시/구 변환 시 캐시에 없는 격자만 카카오 API 호출 (false면 오프라인 추정만 사용)
+REGION_LOOKUP_ONLINE = os.getenv("REGION_LOOKUP_ONLINE", "true").lower() == "true"
+
+# 저장소에 없는 정적 병원 정보 조회 시 동시 호출 수 / 초당 최대 호출 수
+STATIC_FETCH_CONCURRENCY = int(os.getenv("STATIC_FETCH_CONCURRENCY", "8"))
+STATIC_FETCH_RATE_PER_SEC = float(os.getenv("STATIC_FETCH_RATE_PER_SEC", "10"))
+
+# /api/emergency/hospitals 단계별 타임아웃 (초)
+PARSE_TIMEOUT_SEC = float(os.getenv("PARSE_TIMEOUT_SEC", "15"))
+REGION_TIMEOUT_SEC = float(os.getenv("REGION_TIMEOUT_SEC", "5"))
+SEARCH_TIMEOUT_SEC = float(os.getenv("SEARCH_TIMEOUT_SEC", "20"))
+EXPLAIN_TIMEOUT_SEC = float(os.getenv("EXPLAIN_TIMEOUT_SEC", "15"))
+
+# 스냅샷이 없을 때 구 단위 실시간 API 동시 호출 수 / 전체 마감 시간 (초)
+DISTRICT_SEARCH_CONCURRENCY = int(os.getenv("DISTRICT_SEARCH_CONCURRENCY", "8"))
+DISTRICT_SEARCH_TIMEOUT_SEC = float(os.getenv("DISTRICT_SEARCH_TIMEOUT_SEC", "12"))
+
+# 실시간 API 여러 페이지 동시 조회 수
+PAGE_FETCH_CONCURRENCY = int(os.getenv("PAGE_FETCH_CONCURRENCY", "4"))
+
+# 추천 결과 캐시 (같은 격자 / 환자 조건 / 스냅샷 버전이면 재사용)
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_TTL_SEC = float(os.getenv("RESULT_CACHE_TTL_SEC", "30"))
+
+# 응급 상황 텍스트 파싱 캐시 (정규화한 문장 일치 + 임베딩 유사도)
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "512"))
+PARSE_CACHE_TTL_SEC = float(os.getenv("PARSE_CACHE_TTL_SEC", "3600"))
+# 유사 문장(임베딩) 적중은 기본 꺼짐 → src/llm/eval_parse_cache.py로 오적중률 확인 후 켜기
+PARSE_CACHE_SEMANTIC = os.getenv("PARSE_CACHE_SEMANTIC", "false").lower() == "true"
+PARSE_CACHE_SIMILARITY = float(os.getenv("PARSE_CACHE_SIMILARITY", "0.93"))
+
+# 로컬 triage 분류기 (src/ml/triage.py): 확신도(모든 항목 확률 중 최소)가 이 값 이상이면 LLM 파싱 생략
+# threshold는 python -m src.ml.eval_triage의 "권장 TRIAGE_CONFIDENCE_THRESHOLD" 값으로 설정
+TRIAGE_LOCAL_ENABLED = os.getenv("TRIAGE_LOCAL_ENABLED", "true").lower() == "true"
+TRIAGE_CONFIDENCE_THRESHOLD = float(os.getenv("TRIAGE_CONFIDENCE_THRESHOLD", "0.95"))
+# LLM 파싱 결과(응급 상황 원문 포함) 학습용 기록: 건강 정보가 들어갈 수 있으므로 기본 꺼짐
+# 켜면 보존 기간 / 최대 개수를 넘는 기록은 주기적으로 삭제
+TRIAGE_LOG_ENABLED = os.getenv("TRIAGE_LOG_ENABLED", "false").lower() == "true"
+TRIAGE_LOG_RETENTION_DAYS = float(os.getenv("TRIAGE_LOG_RETENTION_DAYS", "30"))
+TRIAGE_LOG_MAX_RECORDS = int(os.getenv("TRIAGE_LOG_MAX_RECORDS", "20000"))
+
+# 응급 상황(incident) 세션: 한 번 파싱한 환자 정보를 /guidance, /hospitals가 공유
+INCIDENT_STORE_SIZE = int(os.getenv("INCIDENT_STORE_SIZE", "1024"))
+INCIDENT_TTL_SEC = float(os.getenv("INCIDENT_TTL_SEC", "1800"))
+
+# 병원 추천 이유 백그라운드 생성 결과 보관 (GET /api/emergency/explanations/{id})
+EXPLANATION_STORE_SIZE = int(os.getenv("EXPLANATION_STORE_SIZE", "1024"))
+EXPLANATION_TTL_SEC = float(os.getenv("EXPLANATION_TTL_SEC", "600"))
+
+# 외부 HTTP 호출 공통 설정 (src/utils/http_client.py)
+HTTP_CONNECT_TIMEOUT_SEC = float(os.getenv("HTTP_CONNECT_TIMEOUT_SEC", "3"))
+HTTP_READ_TIMEOUT_SEC = float(os.getenv("HTTP_READ_TIMEOUT_SEC", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "16"))
+# 공공 API 응답이 이 시간(초) 안에 오지 않으면 같은 요청을 한 번 더 보냄 (기본 0 = 사용 안 함)
+# 공공 API는 일일 호출 한도가 있고 재시도(HTTP_RETRIES)마다 hedge 요청이 추가되므로
+# 한도에 여유가 있을 때만 켤 것 (예: PUBLIC_API_HEDGE_SEC=2)
+PUBLIC_API_HEDGE_SEC = float(os.getenv("PUBLIC_API_HEDGE_SEC", "0"))
 
 if not SERVICE_KEY:
     raise RuntimeError("SERVICE_KEY is not set in .env")
@@ -8,11 +8,13 @@
 import os
 import pandas as pd
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 from src.hospital.search import search_nearby_hospitals
-from src.llm.emergency_parser import parse_emergency_text
-from src.ml.feature_builder import build_ml_features
-from src.ml.recommend import recommend_hospitals
+from src.ml.triage import triage_emergency_text
+from src.ml.feature_builder import build_ml_feature_matrix, matrix_to_payloads
+from src.ml.recommend import recommend_from_matrix
+from src.ml.schema import FEATURES
 from src.utils.rank_merger import merge_rank_with_payloads
 from src.llm.hospital_explainer import explain_hospital_ranking
 from src.rag.rag_guidance import generate_emergency_guidance
@@ -25,11 +27,29 @@ def main():
 
     emergency_text = "어떤 남자가 흉부에 칼을 찔려서 쓰려져있습니다."
 
-    # LLM에게 보낼 텍스트
-    patient_info = parse_emergency_text(
+    # 로컬 triage (확신도가 낮으면 LLM 파싱)
+    patient_info = triage_emergency_text(
         emergency_text
     )
 
+    # 응급 대응 지침 (RAG)은 병원 추천과 무관하므로 파싱 직후 백그라운드에서 시작
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        guidance_future = executor.submit(
+            generate_emergency_guidance,
+            emergency_text,
+            patient_info.get("suspected_condition", "UNKNOWN")
+        )
+
+        recommend_hospitals(patient_info, user_lat, user_lon)
+
+        guidance = guidance_future.result()
+
+    print("\n응급 대응 지침")
+    print(json.dumps(guidance, ensure_ascii=False, indent=2))
+
+
+# 후보 탐색 → ML 추천 → 추천 이유 (LLM)
+def recommend_hospitals(patient_info: dict, user_lat: float, user_lon: float):
     # 주변 병원 후보 탐색
     result_df = search_nearby_hospitals(
         city="서울특별시",
@@ -78,25 +98,13 @@ def main():
         return
 
 
-    # ML Feature 생성
-    ml_features = []
-    hospital_payloads = []  # recommend_hospitals에 넘길 리스트
-
-    for _, row in result_df.iterrows():
-        feature = build_ml_features(row, patient_info)
-        ml_features.append(feature)
+    # ML Feature 생성 (후보 전체를 한 번에 행렬로)
+    X, meta = build_ml_feature_matrix(result_df, patient_info)
 
-        # meta는 row가 아니라 feature에서 꺼내기 (None 방지)
-        hospital_payloads.append({
-            "meta": {
-                "hospital_name": feature.get("hospital_name"),
-                "hospital_id": feature.get("hospital_id"),
-                "hospital_phone": feature.get("hospital_phone"),
-            },
-            "features": feature
-        })
-
-    ml_df = pd.DataFrame(ml_features)
+    ml_df = pd.concat(
+        [meta, pd.DataFrame(X, columns=FEATURES)],
+        axis=1
+    )
 
     # CSV 저장
     PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
@@ -110,8 +118,9 @@ def main():
     print(ml_df.head())
 
     # ML 추천 (확률 예측 + threshold + Top-K)
-    recommendations = recommend_hospitals(
-        hospital_payloads,
+    recommendations = recommend_from_matrix(
+        X,
+        meta,
         threshold=0.01,
         top_k=5,
         max_filter_level=2,
@@ -133,6 +142,10 @@ def main():
         else:
             print(f"{rank}위 | {name} (ID: {hid}) | 전화: {phone} | 수용확률={prob:.3f}")
 
+    hospital_payloads = matrix_to_payloads(
+        X, meta, [r["row"] for r in recommendations]
+    )
+
     final_results = merge_rank_with_payloads(
         recommendations,
         hospital_payloads
@@ -148,12 +161,6 @@ def main():
     print("\n 병원 추천 이유 설명:")
     print(explanation)
 
-    # 응급 대응 지침 (RAG)
-    guidance = generate_emergency_guidance(emergency_text)
-
-    print("\n응급 대응 지침")
-    print(json.dumps(guidance, ensure_ascii=False, indent=2))
-
 
 if __name__ == "__main__":
     main()
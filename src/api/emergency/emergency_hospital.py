@@ -1,68 +1,154 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
 from src.api.emergency.schemas import (
     EmergencyHospitalRequest,
     EmergencyHospitalResponse,
+    ExplanationResponse,
     HospitalItem,
     HospitalExplanation,
     HospitalReason,
 )
 
-from src.hospital.search import search_nearby_hospitals
-from src.llm.emergency_parser import parse_emergency_text
-from src.ml.feature_builder import build_ml_features
-from src.ml.recommend import recommend_hospitals
+from config import EXPLAIN_TIMEOUT_SEC, SEARCH_TIMEOUT_SEC
+from src.api.emergency.explanation_store import explanation_store
+from src.api.emergency.incident_store import resolve_incident_async
+from src.hospital.result_cache import recommendation_cache, recommendation_cache_key
+from src.hospital.search import (
+    MAX_FILTER_LEVEL,
+    prepare_search_region_async,
+    search_nearby_hospitals_async,
+)
+from src.ml.feature_builder import build_ml_feature_matrix, matrix_to_payloads
+from src.ml.recommend import recommend_from_matrix
+from src.opendata.snapshot import snapshot_version
 from src.utils.rank_merger import merge_rank_with_payloads
-from src.llm.hospital_explainer import explain_hospital_ranking
+from src.llm.hospital_explainer import explain_hospital_ranking_async
 
 router = APIRouter(prefix="/api/emergency", tags=["Emergency"])
 
 
-@router.post("/hospitals", response_model=EmergencyHospitalResponse)
-def recommend_emergency_hospitals(req: EmergencyHospitalRequest):
+# 후보 탐색 → feature → 추천 (같은 격자 / 환자 조건 / 스냅샷 버전이면 캐시된 결과 사용)
+# 단계별로 yield: ("candidates", 후보 병원 수) → ("ranked", (추천 결과 Top-K, 추천된 병원의 payload))
+async def rank_hospital_stages(
+    patient_info: dict,
+    city: str | None,
+    district: str | None,
+    user_lat: float,
+    user_lon: float
+):
 
-    # 1. 환자 정보 파싱
-    patient_info = parse_emergency_text(req.emergency_text)
+    cache_key = recommendation_cache_key(user_lat, user_lon, patient_info)
+    cache_version = snapshot_version()
 
-    # 2. 병원 후보 탐색
-    result_df = search_nearby_hospitals(
-        city=None,
-        district=None,
-        patient_info=patient_info,
-        user_lat=req.user_location.lat,
-        user_lon=req.user_location.lon,
+    cached = recommendation_cache.get(cache_key, cache_version)
+    if cached is not None:
+        recommendations, hospital_payloads, candidate_count = cached
+        yield "candidates", candidate_count
+        yield "ranked", (recommendations, hospital_payloads)
+        return
+
+    result_df = await search_candidates(
+        patient_info, city, district, user_lat, user_lon
+    )
+    yield "candidates", len(result_df)
+
+    # feature 행렬 생성 + ML 추천(pandas / numpy)도 탐색 단계처럼 워커 스레드에서
+    recommendations, hospital_payloads = await asyncio.to_thread(
+        rank_candidates, result_df, patient_info
     )
 
+    recommendation_cache.put(
+        cache_key, (recommendations, hospital_payloads, len(result_df)), cache_version
+    )
+
+    yield "ranked", (recommendations, hospital_payloads)
+
+
+# 반환: (추천 결과 Top-K, 추천된 병원의 payload)
+async def rank_hospitals(
+    patient_info: dict,
+    city: str | None,
+    district: str | None,
+    user_lat: float,
+    user_lon: float
+) -> tuple[list[dict], list[dict]]:
+
+    async for stage, value in rank_hospital_stages(
+        patient_info, city, district, user_lat, user_lon
+    ):
+        if stage == "ranked":
+            return value
+
+
+async def search_candidates(
+    patient_info: dict,
+    city: str | None,
+    district: str | None,
+    user_lat: float,
+    user_lon: float
+):
+
+    # 2. 병원 후보 탐색
+    try:
+        result_df = await asyncio.wait_for(
+            search_nearby_hospitals_async(
+                city=city,
+                district=district,
+                patient_info=patient_info,
+                user_lat=user_lat,
+                user_lon=user_lon,
+            ),
+            timeout=SEARCH_TIMEOUT_SEC
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="병원 후보 탐색 시간이 초과되었습니다.")
+
     if result_df.empty:
         raise HTTPException(status_code=404, detail="병원 후보를 찾을 수 없습니다.")
 
-    # 3. ML Feature 생성
-    hospital_payloads = []
+    return result_df
 
-    for _, row in result_df.iterrows():
-        feature = build_ml_features(row, patient_info)
 
-        hospital_payloads.append({
-            "meta": {
-                "hospital_id": feature.get("hospital_id"),
-                "hospital_name": feature.get("hospital_name"),
-                "hospital_phone": feature.get("hospital_phone"),
-            },
-            "features": feature,
-        })
+def rank_candidates(result_df, patient_info: dict) -> tuple[list[dict], list[dict]]:
+    # 3. ML Feature 생성 (후보 전체를 한 번에 행렬로)
+    X, meta = build_ml_feature_matrix(result_df, patient_info)
 
     # 4. 병원 추천 (ML)
-    recommendations = recommend_hospitals(
-        hospital_payloads,
+    recommendations = recommend_from_matrix(
+        X,
+        meta,
         threshold=0.01,
         top_k=5,
-        max_filter_level=2,
+        max_filter_level=MAX_FILTER_LEVEL,
     )
 
     if not recommendations:
         raise HTTPException(status_code=404, detail="추천 가능한 병원이 없습니다.")
 
-    # 5. 추천 결과 정리 (상세 정보 포함)
+    # 추천된 병원만 payload로 변환
+    hospital_payloads = matrix_to_payloads(
+        X, meta, [r["row"] for r in recommendations]
+    )
+
+    return recommendations, hospital_payloads
+
+
+# 위치 → (시, 구) / 실패하면 (None, None) → search 단계에서 다시 시도
+def region_or_none(region) -> tuple[str | None, str | None]:
+    if isinstance(region, BaseException):
+        print(f"[WARN] Region lookup failed, retrying in search: {region!r}")
+        return None, None
+    return region
+
+
+# 추천 결과 + payload → 응답용 HospitalItem 목록
+def build_hospital_items(
+    recommendations: list[dict],
+    hospital_payloads: list[dict]
+) -> list[HospitalItem]:
+
     hospitals = []
 
     # hospital_id → features 매핑
@@ -108,18 +194,40 @@ def recommend_emergency_hospitals(req: EmergencyHospitalRequest):
             )
         )
 
-    # 6. 병원 추천 이유 (LLM)
+    return hospitals
+
+
+# 병원 추천 이유 (LLM) / 실패하거나 늦어도 추천 결과는 그대로 반환
+async def explain_ranking(
+    recommendations: list[dict],
+    hospital_payloads: list[dict],
+    patient_info: dict
+) -> HospitalExplanation:
+
     final_results = merge_rank_with_payloads(
         recommendations,
         hospital_payloads
     )
 
-    explanation_text = explain_hospital_ranking(
-        final_results,
-        patient_info
-    )
+    try:
+        explanation_text = await asyncio.wait_for(
+            explain_hospital_ranking_async(final_results, patient_info),
+            timeout=EXPLAIN_TIMEOUT_SEC
+        )
+    except Exception as e:
+        print(f"[WARN] Failed to explain hospital ranking: {e!r}")
+        explanation_text = failed_explanation()
+
+    return to_hospital_explanation(explanation_text)
+
 
-    explanation = HospitalExplanation(
+def failed_explanation() -> dict:
+    return {"summary": "추천 이유를 생성하지 못했습니다.", "details": []}
+
+
+# LLM 설명 결과(dict) → HospitalExplanation
+def to_hospital_explanation(explanation_text: dict) -> HospitalExplanation:
+    return HospitalExplanation(
         summary=explanation_text.get("summary", ""),
         details=[
             HospitalReason(
@@ -130,8 +238,70 @@ def recommend_emergency_hospitals(req: EmergencyHospitalRequest):
         ],
     )
 
+
+@router.post("/hospitals", response_model=EmergencyHospitalResponse)
+async def recommend_emergency_hospitals(req: EmergencyHospitalRequest):
+    user_lat = req.user_location.lat
+    user_lon = req.user_location.lon
+
+    # 1. 환자 정보 파싱(또는 incident 재사용) + 위치 → 시/구 변환·스냅샷 준비 (서로 독립이므로 동시에)
+    incident, region = await asyncio.gather(
+        resolve_incident_async(req.emergency_text, req.incident_id),
+        prepare_search_region_async(user_lat, user_lon),
+        return_exceptions=True,
+    )
+
+    if isinstance(incident, BaseException):
+        raise incident
+    patient_info = incident["patient_info"]
+
+    city, district = region_or_none(region)
+
+    # 2~4. 병원 후보 탐색 + 추천
+    recommendations, hospital_payloads = await rank_hospitals(
+        patient_info, city, district, user_lat, user_lon
+    )
+
+    # 5. 추천 결과 정리 (상세 정보 포함)
+    hospitals = build_hospital_items(recommendations, hospital_payloads)
+
+    # 6. 병원 추천 이유 (LLM)
+    if req.wait_for_explanation:
+        explanation = await explain_ranking(recommendations, hospital_payloads, patient_info)
+        return EmergencyHospitalResponse(
+            hospitals=hospitals,
+            ranking_explanation=explanation,
+            incident_id=incident["incident_id"],
+        )
+
+    # 기본: 병원 목록을 먼저 응답하고 추천 이유는 백그라운드에서 생성
+    explanation_id = explanation_store.submit(
+        explain_ranking(recommendations, hospital_payloads, patient_info)
+    )
+
     # 7. 응답 반환
     return EmergencyHospitalResponse(
         hospitals=hospitals,
-        ranking_explanation=explanation
+        explanation_id=explanation_id,
+        incident_id=incident["incident_id"],
+    )
+
+
+# 추천 이유 조회 / wait초까지 완료를 기다림 (long polling, 최대 EXPLAIN_TIMEOUT_SEC)
+@router.get("/explanations/{explanation_id}", response_model=ExplanationResponse)
+async def get_ranking_explanation(explanation_id: str, wait: float = 0.0):
+    result = await explanation_store.result(
+        explanation_id,
+        wait=min(max(wait, 0.0), EXPLAIN_TIMEOUT_SEC)
+    )
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="추천 이유를 찾을 수 없습니다. (만료되었거나 잘못된 ID)")
+
+    status, explanation = result
+
+    return ExplanationResponse(
+        explanation_id=explanation_id,
+        status=status,
+        ranking_explanation=explanation,
     )
\ No newline at end of file
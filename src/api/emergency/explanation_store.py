@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import uuid
+
+from cachetools import TTLCache
+
+from config import EXPLANATION_STORE_SIZE, EXPLANATION_TTL_SEC
+
+
+# 병원 추천 이유(LLM)는 응답을 막지 않도록 백그라운드 task로 생성하고 ID로 조회
+# 진행 중인 task는 _pending이 참조 (TTLCache에서 먼저 밀려나도 완료 전에 GC되지 않음)
+class ExplanationStore:
+
+    def __init__(self, maxsize: int = EXPLANATION_STORE_SIZE, ttl: float = EXPLANATION_TTL_SEC):
+        self._tasks = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._pending: set[asyncio.Future] = set()
+        self._lock = threading.Lock()
+
+    # coroutine을 task로 시작하고 explanation_id 반환
+    def submit(self, coro) -> str:
+        explanation_id = uuid.uuid4().hex
+        task = asyncio.ensure_future(coro)
+
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+        with self._lock:
+            self._tasks[explanation_id] = task
+
+        return explanation_id
+
+    def get_task(self, explanation_id: str) -> asyncio.Task | None:
+        with self._lock:
+            return self._tasks.get(explanation_id)
+
+    # 최대 wait초까지 완료를 기다림 → (상태, 결과)
+    # 상태: "pending" / "done" / "failed", 없거나 만료된 ID면 None
+    async def result(self, explanation_id: str, wait: float = 0.0):
+        task = self.get_task(explanation_id)
+        if task is None:
+            return None
+
+        if not task.done() and wait > 0:
+            await asyncio.wait({task}, timeout=wait)
+
+        if not task.done():
+            return "pending", None
+        if task.cancelled() or task.exception() is not None:
+            return "failed", None
+        return "done", task.result()
+
+    # 서버 종료 시 진행 중인 task 취소
+    async def cancel_all(self):
+        with self._lock:
+            self._tasks.clear()
+
+        tasks = list(self._pending)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._tasks)
+        return {
+            "size": size,
+            "pending": len(self._pending),
+        }
+
+
+explanation_store = ExplanationStore()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from src.rag.rag_guidance import generate_emergency_guidance
-from src.llm.emergency_parser import parse_emergency_text
+from src.api.emergency.incident_store import resolve_incident
 from src.api.emergency.schemas import (
     EmergencyGuidanceRequest,
     EmergencyGuidanceResponse
@@ -12,6 +12,19 @@ router = APIRouter(
 )
 
 
+# incident(입력 문장 + 파싱 결과) → 응급 행동 가이드
+def generate_incident_guidance(incident: dict) -> dict:
+    condition = incident["patient_info"].get("suspected_condition", "UNKNOWN")
+
+    guidance = generate_emergency_guidance(
+        query=incident["emergency_text"],
+        condition=condition
+    )
+    guidance["incident_id"] = incident["incident_id"]
+
+    return guidance
+
+
 @router.post(
     "/guidance",
     response_model=EmergencyGuidanceResponse
@@ -19,26 +32,13 @@ router = APIRouter(
 def get_emergency_guidance(
     request: EmergencyGuidanceRequest
 ):
-    emergency_text = request.emergency_text.strip()
-
-    if not emergency_text:
-        raise HTTPException(
-            status_code=400,
-            detail="emergency_text is required"
-        )
-
     try:
-        patient_info = parse_emergency_text(emergency_text)
-        condition = patient_info.get("suspected_condition", "UNKNOWN")
-        print("[DEBUG]")
-        print(condition)
-
-        guidance = generate_emergency_guidance(
-            query=emergency_text,
-            condition=condition
-        )
+        incident = resolve_incident(request.emergency_text, request.incident_id)
+        return generate_incident_guidance(incident)
 
-        return guidance
+    # emergency_text / incident_id 검증 실패는 400 / 404 그대로
+    except HTTPException:
+        raise
 
     except Exception as e:
         raise HTTPException(
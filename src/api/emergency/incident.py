@@ -0,0 +1,113 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+
+from src.api.emergency.emergency_hospital import (
+    build_hospital_items,
+    explain_ranking,
+    rank_hospitals,
+    region_or_none,
+)
+from src.api.emergency.explanation_store import explanation_store
+from src.api.emergency.guidance import generate_incident_guidance
+from src.api.emergency.incident_store import incident_store, resolve_incident_async
+from src.api.emergency.schemas import (
+    EmergencyAssistRequest,
+    EmergencyAssistResponse,
+    IncidentRequest,
+    IncidentResponse,
+)
+from src.hospital.search import prepare_search_region_async
+
+router = APIRouter(prefix="/api/emergency", tags=["Emergency"])
+
+
+# 응급 상황 등록: 파싱 1번 → incident_id 발급
+# 이후 /guidance, /hospitals에 emergency_text 대신 incident_id를 넘기면 파싱 결과를 재사용
+@router.post("/incidents", response_model=IncidentResponse)
+async def create_incident(req: IncidentRequest):
+    incident = await resolve_incident_async(req.emergency_text)
+    return IncidentResponse(
+        incident_id=incident["incident_id"],
+        patient_info=incident["patient_info"],
+    )
+
+
+@router.get("/incidents/{incident_id}", response_model=IncidentResponse)
+async def get_incident(incident_id: str):
+    incident = incident_store.get(incident_id)
+    if incident is None:
+        raise HTTPException(status_code=404, detail="응급 상황 정보를 찾을 수 없습니다. (만료되었거나 잘못된 ID)")
+
+    return IncidentResponse(
+        incident_id=incident["incident_id"],
+        patient_info=incident["patient_info"],
+    )
+
+
+# 가이드 생성 실패는 병원 추천 응답을 막지 않음 (None)
+async def guidance_or_none(incident: dict) -> dict | None:
+    try:
+        return await asyncio.to_thread(generate_incident_guidance, incident)
+    except Exception as e:
+        print(f"[WARN] Failed to generate guidance: {e!r}")
+        return None
+
+
+# 응급 행동 가이드 + 병원 추천을 파싱 1번으로
+# 가이드(RAG)는 파싱 직후 바로 시작 → 병원 추천 → 추천 이유는 가이드와 동시에 백그라운드 생성
+# 가이드가 끝났을 때 추천 이유가 아직이면 explanation_id로 나중에 조회
+@router.post("/assist", response_model=EmergencyAssistResponse)
+async def assist_emergency(req: EmergencyAssistRequest):
+    user_lat = req.user_location.lat
+    user_lon = req.user_location.lon
+
+    # 1. 환자 정보 파싱(또는 incident 재사용) + 위치 → 시/구 변환 (동시에)
+    incident, region = await asyncio.gather(
+        resolve_incident_async(req.emergency_text, req.incident_id),
+        prepare_search_region_async(user_lat, user_lon),
+        return_exceptions=True,
+    )
+
+    if isinstance(incident, BaseException):
+        raise incident
+    patient_info = incident["patient_info"]
+
+    # 2. 가이드(RAG)는 같은 파싱 결과로 병원 추천과 동시에
+    guidance_task = asyncio.ensure_future(guidance_or_none(incident))
+
+    # 3. 병원 후보 탐색 + 추천
+    city, district = region_or_none(region)
+
+    try:
+        recommendations, hospital_payloads = await rank_hospitals(
+            patient_info, city, district, user_lat, user_lon
+        )
+    except BaseException:
+        guidance_task.cancel()
+        raise
+
+    hospitals = build_hospital_items(recommendations, hospital_payloads)
+
+    # 4. 추천 이유 (LLM)는 가이드와 동시에 백그라운드 생성
+    explanation_id = explanation_store.submit(
+        explain_ranking(recommendations, hospital_payloads, patient_info)
+    )
+
+    guidance = await guidance_task
+
+    # 그 사이 저장소에서 밀려났으면 (만료 / 용량 초과) 추천 이유 없이 응답
+    result = await explanation_store.result(explanation_id)
+    if result is None:
+        explanation, explanation_id = None, None
+    else:
+        _, explanation = result
+
+    return EmergencyAssistResponse(
+        incident_id=incident["incident_id"],
+        patient_info=patient_info,
+        guidance=guidance,
+        hospitals=hospitals,
+        ranking_explanation=explanation,
+        explanation_id=explanation_id,
+    )
\ No newline at end of file
@@ -0,0 +1,88 @@
+import asyncio
+import copy
+import threading
+import uuid
+
+from cachetools import TTLCache
+from fastapi import HTTPException
+
+from config import INCIDENT_STORE_SIZE, INCIDENT_TTL_SEC, PARSE_TIMEOUT_SEC
+from src.llm.parse_cache import parse_with_cache, parse_with_cache_async
+
+
+# 응급 상황 1건 = (입력 문장, 파싱된 patient_info)
+# 프론트가 /guidance와 /hospitals를 따로 호출해도 파싱은 한 번만 하도록 ID로 공유
+class IncidentStore:
+
+    def __init__(self, maxsize: int = INCIDENT_STORE_SIZE, ttl: float = INCIDENT_TTL_SEC):
+        self._incidents = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def create(self, emergency_text: str, patient_info: dict) -> str:
+        incident_id = uuid.uuid4().hex
+        with self._lock:
+            self._incidents[incident_id] = {
+                "incident_id": incident_id,
+                "emergency_text": emergency_text,
+                "patient_info": copy.deepcopy(patient_info),
+            }
+        return incident_id
+
+    # 없거나 만료되었으면 None
+    def get(self, incident_id: str) -> dict | None:
+        with self._lock:
+            incident = self._incidents.get(incident_id)
+        return copy.deepcopy(incident) if incident is not None else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._incidents)}
+
+
+incident_store = IncidentStore()
+
+
+def _get_incident_or_404(incident_id: str) -> dict:
+    incident = incident_store.get(incident_id)
+    if incident is None:
+        raise HTTPException(status_code=404, detail="응급 상황 정보를 찾을 수 없습니다. (만료되었거나 잘못된 ID)")
+    return incident
+
+
+def _require_text(emergency_text: str | None) -> str:
+    emergency_text = (emergency_text or "").strip()
+    if not emergency_text:
+        raise HTTPException(status_code=400, detail="emergency_text or incident_id is required")
+    return emergency_text
+
+
+# incident_id가 있으면 저장된 파싱 결과, 없으면 새로 파싱해서 incident 생성
+# → {"incident_id", "emergency_text", "patient_info"}
+def resolve_incident(emergency_text: str | None, incident_id: str | None = None) -> dict:
+    if incident_id:
+        return _get_incident_or_404(incident_id)
+
+    emergency_text = _require_text(emergency_text)
+    patient_info = parse_with_cache(emergency_text)
+    incident_id = incident_store.create(emergency_text, patient_info)
+
+    return {"incident_id": incident_id, "emergency_text": emergency_text, "patient_info": patient_info}
+
+
+async def resolve_incident_async(emergency_text: str | None, incident_id: str | None = None) -> dict:
+    if incident_id:
+        return _get_incident_or_404(incident_id)
+
+    emergency_text = _require_text(emergency_text)
+
+    try:
+        patient_info = await asyncio.wait_for(
+            parse_with_cache_async(emergency_text),
+            timeout=PARSE_TIMEOUT_SEC
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="환자 정보 분석 시간이 초과되었습니다.")
+
+    incident_id = incident_store.create(emergency_text, patient_info)
+
+    return {"incident_id": incident_id, "emergency_text": emergency_text, "patient_info": patient_info}
\ No newline at end of file
@@ -1,14 +1,17 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+# emergency_text 대신 이전 응답의 incident_id를 넘기면 파싱 결과를 재사용
 class EmergencyGuidanceRequest(BaseModel):
-    emergency_text: str
+    emergency_text: Optional[str] = None
+    incident_id: Optional[str] = None
 
 
 class EmergencyGuidanceResponse(BaseModel):
     situation_summary: str
     immediate_actions: List[str]
     do_not_do: List[str]
+    incident_id: Optional[str] = None
 
 class Location(BaseModel):
     lat: float
@@ -16,8 +19,12 @@ class Location(BaseModel):
 
 
 class EmergencyHospitalRequest(BaseModel):
-    emergency_text: str
+    emergency_text: Optional[str] = None
+    incident_id: Optional[str] = None
     user_location: Location
+    # True면 추천 이유(LLM)까지 기다렸다가 함께 응답
+    # False면 병원 목록만 먼저 응답하고 추천 이유는 explanation_id로 조회
+    wait_for_explanation: bool = False
 
 
 class HospitalItem(BaseModel):
@@ -65,4 +72,46 @@ class HospitalExplanation(BaseModel):
 
 class EmergencyHospitalResponse(BaseModel):
     hospitals: List[HospitalItem]
-    ranking_explanation: HospitalExplanation
\ No newline at end of file
+    # 아직 생성 중이면 None → GET /api/emergency/explanations/{explanation_id}
+    ranking_explanation: Optional[HospitalExplanation] = None
+    explanation_id: Optional[str] = None
+    incident_id: Optional[str] = None
+
+
+class ExplanationResponse(BaseModel):
+    explanation_id: str
+    status: str  # pending / done / failed
+    ranking_explanation: Optional[HospitalExplanation] = None
+
+
+class PatientInfo(BaseModel):
+    severity: str = "MEDIUM"
+    suspected_condition: str = "UNKNOWN"
+    required_resources: Dict[str, bool] = {}
+    notes: Optional[str] = None
+    confidence: Optional[float] = None
+
+
+class IncidentRequest(BaseModel):
+    emergency_text: str
+
+
+class IncidentResponse(BaseModel):
+    incident_id: str
+    patient_info: PatientInfo
+
+
+# 파싱 1번으로 응급 행동 가이드 + 병원 추천을 한 번에
+class EmergencyAssistRequest(BaseModel):
+    emergency_text: Optional[str] = None
+    incident_id: Optional[str] = None
+    user_location: Location
+
+
+class EmergencyAssistResponse(BaseModel):
+    incident_id: str
+    patient_info: PatientInfo
+    guidance: Optional[EmergencyGuidanceResponse]
+    hospitals: List[HospitalItem]
+    ranking_explanation: Optional[HospitalExplanation] = None
+    explanation_id: Optional[str] = None
\ No newline at end of file
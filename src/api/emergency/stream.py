@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from config import EXPLAIN_TIMEOUT_SEC
+from src.api.emergency.emergency_hospital import (
+    build_hospital_items,
+    failed_explanation,
+    rank_hospital_stages,
+    region_or_none,
+    to_hospital_explanation,
+)
+from src.api.emergency.incident_store import resolve_incident_async
+from src.api.emergency.schemas import EmergencyHospitalRequest
+from src.hospital.search import prepare_search_region_async
+from src.llm.hospital_explainer import (
+    empty_explanation,
+    explain_hospital_ranking_stream,
+    parse_llm_output,
+)
+from src.utils.rank_merger import merge_rank_with_payloads
+
+router = APIRouter(prefix="/api/emergency", tags=["Emergency"])
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # 프록시(nginx) 버퍼링 끄기
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# 추천 이유를 토큰 단위로 ("delta", 텍스트 조각) yield 후 마지막에 ("explanation", HospitalExplanation)
+# 전체 생성 시간은 EXPLAIN_TIMEOUT_SEC로 제한, 실패하면 기본 문구
+async def stream_explanation(
+    recommendations: list[dict],
+    hospital_payloads: list[dict],
+    patient_info: dict
+):
+
+    final_results = merge_rank_with_payloads(recommendations, hospital_payloads)
+
+    # 추천 결과가 없으면 LLM 없이 비스트리밍 경로와 같은 기본 문구
+    if not final_results:
+        yield "explanation", to_hospital_explanation(empty_explanation())
+        return
+
+    deadline = time.monotonic() + EXPLAIN_TIMEOUT_SEC
+    chunks = []
+
+    stream = explain_hospital_ranking_stream(final_results, patient_info)
+
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+
+            try:
+                delta = await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                break
+
+            chunks.append(delta)
+            yield "delta", delta
+
+        explanation = to_hospital_explanation(parse_llm_output("".join(chunks)))
+
+    except Exception as e:
+        print(f"[WARN] Failed to stream hospital ranking explanation: {e!r}")
+        explanation = to_hospital_explanation(failed_explanation())
+
+    finally:
+        await stream.aclose()
+
+    yield "explanation", explanation
+
+
+# 단계별 SSE 이벤트
+# triage → candidates → hospitals → explanation_delta (여러 번) → explanation → done
+# 중간에 실패하면 error 이벤트 후 종료 (응답 헤더는 이미 보냈으므로 HTTP 상태 코드 대신)
+async def emergency_event_stream(req: EmergencyHospitalRequest):
+    started = time.perf_counter()
+    user_lat = req.user_location.lat
+    user_lon = req.user_location.lon
+
+    def elapsed_ms() -> int:
+        return int((time.perf_counter() - started) * 1000)
+
+    # 위치 → 시/구 변환은 파싱과 동시에
+    region_task = asyncio.ensure_future(prepare_search_region_async(user_lat, user_lon))
+
+    try:
+        # 1. 환자 정보 (triage)
+        incident = await resolve_incident_async(req.emergency_text, req.incident_id)
+        patient_info = incident["patient_info"]
+
+        yield sse_event("triage", {
+            "incident_id": incident["incident_id"],
+            "patient_info": patient_info,
+            "elapsed_ms": elapsed_ms(),
+        })
+
+        region = (await asyncio.gather(region_task, return_exceptions=True))[0]
+        city, district = region_or_none(region)
+
+        # 2. 후보 병원 수 → 3. 추천 병원 목록
+        async for stage, value in rank_hospital_stages(
+            patient_info, city, district, user_lat, user_lon
+        ):
+            if stage == "candidates":
+                yield sse_event("candidates", {"count": value, "elapsed_ms": elapsed_ms()})
+            else:
+                recommendations, hospital_payloads = value
+
+        hospitals = build_hospital_items(recommendations, hospital_payloads)
+
+        yield sse_event("hospitals", {
+            "hospitals": [h.model_dump() for h in hospitals],
+            "elapsed_ms": elapsed_ms(),
+        })
+
+        # 4. 추천 이유 (LLM 토큰 스트리밍)
+        async for kind, value in stream_explanation(
+            recommendations, hospital_payloads, patient_info
+        ):
+            if kind == "delta":
+                yield sse_event("explanation_delta", {"text": value})
+            else:
+                yield sse_event("explanation", value.model_dump())
+
+        yield sse_event("done", {"elapsed_ms": elapsed_ms()})
+
+    except HTTPException as e:
+        yield sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+
+    except Exception as e:
+        print(f"[ERROR] Emergency stream failed: {e!r}")
+        yield sse_event("error", {"status_code": 500, "detail": "응급 병원 추천 중 오류가 발생했습니다."})
+
+    finally:
+        region_task.cancel()
+
+
+# /hospitals의 스트리밍 버전 (text/event-stream)
+@router.post("/hospitals/stream")
+async def stream_emergency_hospitals(req: EmergencyHospitalRequest):
+    return StreamingResponse(
+        emergency_event_stream(req),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
\ No newline at end of file
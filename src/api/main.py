@@ -1,12 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.emergency.guidance import router as guidance_router
 from src.api.emergency.emergency_hospital import router as emergency_hospital_router
+from src.api.emergency.explanation_store import explanation_store
+from src.api.emergency.incident import router as incident_router
+from src.api.emergency.incident_store import incident_store
+from src.api.emergency.stream import router as stream_router
+from src.hospital.result_cache import recommendation_cache
+from src.llm.parse_cache import parse_cache
+from src.ml.recommend import load_model
+from src.opendata.snapshot import snapshot_status
+from src.opendata.snapshot_poller import start_snapshot_poller, stop_snapshot_poller
+from src.rag.retriever import is_retriever_ready, warmup_retriever
+from src.utils.http_client import close_http_clients
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 수용 가능성 모델은 요청마다 로드하지 않도록 시작 시 1회 로드
+    load_model()
+
+    # RAG 임베딩 모델 / FAISS 인덱스는 백그라운드 스레드에서 미리 로드
+    # (준비 전 요청은 로드가 끝날 때까지 기다림)
+    rag_warmup = asyncio.create_task(asyncio.to_thread(warmup_retriever))
+
+    # 실시간 병상 스냅샷 백그라운드 갱신 시작
+    start_snapshot_poller()
+    yield
+    await stop_snapshot_poller()
+    await explanation_store.cancel_all()
+    await asyncio.gather(rag_warmup, return_exceptions=True)
+    await close_http_clients()
+
 
 app = FastAPI(
     title="Emergency AI API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -21,7 +55,26 @@ app.add_middleware(
 # Router 등록
 app.include_router(guidance_router)
 app.include_router(emergency_hospital_router)
+app.include_router(incident_router)
+app.include_router(stream_router)
 
 @app.get("/")
 def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok", "rag_ready": is_retriever_ready()}
+
+
+# 실시간 병상 스냅샷 버전 / 경과 시간
+@app.get("/snapshots")
+def get_snapshot_status():
+    return snapshot_status()
+
+
+# 결과 캐시 크기 / 적중률
+@app.get("/cache")
+def get_cache_status():
+    return {
+        "parse": parse_cache.stats(),
+        "recommendations": recommendation_cache.stats(),
+        "incidents": incident_store.stats(),
+        "explanations": explanation_store.stats(),
+    }
\ No newline at end of file
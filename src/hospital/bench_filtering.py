@@ -0,0 +1,242 @@
+# filter_hospitals 단일 패스 구현과 기존 다단계 구현의 결과 비교 + 속도 측정 파일
+# 실행: python -m src.hospital.bench_filtering
+
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.hospital.filtering import filter_hospitals
+
+N_HOSPITALS = 10_000
+REPEAT = 5
+
+CONDITIONS = ["CARDIAC", "RESPIRATORY", "NEURO", "TRAUMA", "BURN", "PEDIATRIC", "UNKNOWN"]
+
+
+# ----- 기준 구현 (단일 패스 리팩터링 이전 src/hospital/filtering.py를 그대로 복사) -----
+# 결과 비교의 기준이므로 수정하지 말 것 (현재 filtering.py의 함수를 쓰면 새 코드끼리 비교하게 됨)
+
+# NaN, None을 안전하게 int 변환
+def safe_int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# 컬럼이 없으면 기본값으로 생성
+def ensure_column(df: pd.DataFrame, col: str, default):
+    if col not in df.columns:
+        df[col] = default
+    return df
+
+
+
+
+def filter_hospitals_strict(
+    hospital_df: pd.DataFrame,
+    patient_info: dict
+) -> pd.DataFrame:
+
+    df = hospital_df.copy()
+
+    # 필수 컬럼 보정
+    int_columns = ["hvec", "hvicc", "hvccc", "hvcc", "hv9", "hv8"]
+    yn_columns = ["hvventiayn", "hvctayn", "hvmriayn", "hv10", "hv11"]
+
+    for col in int_columns:
+        df = ensure_column(df, col, 0)
+        df[col] = df[col].apply(safe_int)
+
+    for col in yn_columns:
+        df = ensure_column(df, col, "N")
+
+    # 1. 응급실 필수
+    df = df[df["hvec"] > 0]
+
+    # 2. ICU 필요 여부
+    if patient_info["required_resources"]["need_icu"]:
+        df = df[df["hvicc"] > 0]
+
+    # 3. 인공호흡기
+    if patient_info["required_resources"]["need_ventilator"]:
+        df = df[df["hvventiayn"] == "Y"]
+
+    # 4. CT / MRI
+    if patient_info["required_resources"]["need_ct"]:
+        df = df[df["hvctayn"] == "Y"]
+
+    if patient_info["required_resources"]["need_mri"]:
+        df = df[df["hvmriayn"] == "Y"]
+
+    # 5. 질환별 조건
+    condition = patient_info["suspected_condition"]
+
+    if condition == "CARDIAC":
+        df = df[df["hvccc"] > 0]
+
+    elif condition == "RESPIRATORY":
+        df = df[df["hvventiayn"] == "Y"]
+
+    elif condition == "NEURO":
+        df = df[df["hvcc"] > 0]
+
+    elif condition == "TRAUMA":
+        df = df[df["hv9"] > 0]
+
+    elif condition == "BURN":
+        df = df[df["hv8"] > 0]
+
+    elif condition == "PEDIATRIC":
+        df = df[(df["hv10"] == "Y") | (df["hv11"] == "Y")]
+
+    return df.reset_index(drop=True)
+
+
+# 단계별로 필터링을 완화하며, 병원별 최초 통과 filter_level을 기록하여 반환
+def filter_hospitals_multipass(
+    hospital_df: pd.DataFrame,
+    patient_info: dict,
+    min_candidates: int = 5
+) -> pd.DataFrame:
+
+
+    collected = []
+    seen_hpid = set()
+
+    # Level 0: 완전 매칭
+    df0 = filter_hospitals_strict(hospital_df, patient_info)
+    if not df0.empty:
+        df0 = df0.copy()
+        df0["filter_level"] = 0
+        collected.append(df0)
+        seen_hpid.update(df0["hpid"])
+
+    # Level 1: 질환 조건 완화
+    relaxed_info_1 = patient_info.copy()
+    relaxed_info_1["suspected_condition"] = "UNKNOWN"
+
+    df1 = filter_hospitals_strict(hospital_df, relaxed_info_1)
+    df1 = df1[~df1["hpid"].isin(seen_hpid)]
+
+    if not df1.empty:
+        df1 = df1.copy()
+        df1["filter_level"] = 1
+        collected.append(df1)
+        seen_hpid.update(df1["hpid"])
+
+    # Level 2: ICU 요구 완화
+    relaxed_info_2 = relaxed_info_1.copy()
+    relaxed_info_2["required_resources"]["need_icu"] = False
+
+    df2 = filter_hospitals_strict(hospital_df, relaxed_info_2)
+    df2 = df2[~df2["hpid"].isin(seen_hpid)]
+
+    if not df2.empty:
+        df2 = df2.copy()
+        df2["filter_level"] = 2
+        collected.append(df2)
+        seen_hpid.update(df2["hpid"])
+
+    # Level 3: 응급실만 있으면 OK
+    df3 = hospital_df.copy()
+    df3 = ensure_column(df3, "hvec", 0)
+    df3["hvec"] = df3["hvec"].apply(safe_int)
+    df3 = df3[df3["hvec"] > 0]
+    df3 = df3[~df3["hpid"].isin(seen_hpid)]
+
+    if not df3.empty:
+        df3 = df3.copy()
+        df3["filter_level"] = 3
+        collected.append(df3)
+
+    if not collected:
+        return pd.DataFrame()
+
+    result = pd.concat(collected).reset_index(drop=True)
+    return result
+
+
+# ----- 기준 구현 끝 -----
+
+
+# 공공 API 응답과 같은 형태(문자열 값)의 가상 병원 데이터
+def make_synthetic_hospitals(n: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    def counts(high):
+        return rng.integers(-2, high, size=n).astype(str)
+
+    def yn(p):
+        return np.where(rng.random(n) < p, "Y", "N")
+
+    return pd.DataFrame({
+        "hpid": [f"H{i:06d}" for i in range(n)],
+        "dutyname": [f"병원{i}" for i in range(n)],
+        "hvec": counts(20),
+        "hvicc": counts(8),
+        "hvccc": counts(4),
+        "hvcc": counts(4),
+        "hv9": counts(3),
+        "hv8": counts(3),
+        "hvventiayn": yn(0.8),
+        "hvctayn": yn(0.85),
+        "hvmriayn": yn(0.6),
+        "hv10": yn(0.3),
+        "hv11": yn(0.3),
+    })
+
+
+def make_patient(condition: str, need_icu: bool) -> dict:
+    return {
+        "severity": "HIGH",
+        "suspected_condition": condition,
+        "required_resources": {
+            "need_icu": need_icu,
+            "need_ventilator": condition == "RESPIRATORY",
+            "need_ct": True,
+            "need_mri": False,
+        },
+        "confidence": 0.8,
+    }
+
+
+# 기준 구현은 patient_info의 required_resources를 직접 바꾸므로(얕은 복사) 매번 새 복사본으로 호출
+def timed(fn, hospital_df: pd.DataFrame, patient_info: dict) -> tuple[pd.DataFrame, float]:
+    best = float("inf")
+    result = None
+    for _ in range(REPEAT):
+        patient = copy.deepcopy(patient_info)
+        start = time.perf_counter()
+        result = fn(hospital_df, patient)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    hospital_df = make_synthetic_hospitals(N_HOSPITALS)
+    print(f"synthetic hospitals: {len(hospital_df)}")
+
+    for condition in CONDITIONS:
+        for need_icu in (True, False):
+            patient = make_patient(condition, need_icu)
+
+            old, t_old = timed(filter_hospitals_multipass, hospital_df, patient)
+            new, t_new = timed(filter_hospitals, hospital_df, patient)
+
+            same = (
+                old["hpid"].tolist() == new["hpid"].tolist()
+                and old["filter_level"].tolist() == new["filter_level"].tolist()
+            )
+
+            print(
+                f"{condition:<12} need_icu={need_icu!s:<5}  rows={len(new):>5}  "
+                f"multipass={t_old * 1000:7.2f}ms  single={t_new * 1000:7.2f}ms  "
+                f"x{t_old / t_new:4.1f}  same={same}"
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,9 +1,17 @@
 import math
-from src.hospital.location import get_hospital_location
+import numpy as np
+import pandas as pd
+from src.hospital.location import get_hospital_locations, get_hospital_locations_by_hpid
+
+EARTH_RADIUS_KM = 6371
+
+# 시속 30km 가정 → 1km당 2분
+MIN_PER_KM = 2
+
 
 # 두 좌표 간 거리 계산
 def haversine_distance(lat1, lon1, lat2, lon2) -> float:
-    R = 6371
+    R = EARTH_RADIUS_KM
 
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
@@ -17,33 +25,79 @@ def haversine_distance(lat1, lon1, lat2, lon2) -> float:
 
     return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
-# 거리 계산은 haversine_distance 방식으로 계산
-# 시속 30km 일 때를 가정
-def add_distance_features(df, user_lat, user_lon):
 
-    distances = []
-    times = []
+# haversine_distance의 NumPy 버전 (배열끼리 브로드캐스팅, NaN 좌표는 NaN 거리)
+def haversine_distance_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = np.radians(np.asarray(lon2, dtype=float) - np.asarray(lon1, dtype=float))
+
+    a = (
+        np.sin(d_phi / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin(d_lambda / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+# 여러 사용자 위치 × 여러 병원 거리 행렬 (shape: [사용자 수, 병원 수])
+def distance_matrix(user_lats, user_lons, hospital_lats, hospital_lons) -> np.ndarray:
+    user_lats = np.asarray(user_lats, dtype=float).reshape(-1, 1)
+    user_lons = np.asarray(user_lons, dtype=float).reshape(-1, 1)
+    hospital_lats = np.asarray(hospital_lats, dtype=float).reshape(1, -1)
+    hospital_lons = np.asarray(hospital_lons, dtype=float).reshape(1, -1)
 
-    for _, row in df.iterrows():
-        hospital_name = row["dutyname"]
-        location = get_hospital_location(hospital_name)
+    return haversine_distance_np(user_lats, user_lons, hospital_lats, hospital_lons)
 
-        if not location:
-            distances.append(None)
-            times.append(None)
-            continue
 
-        dist = haversine_distance(
-            user_lat,
-            user_lon,
-            location["lat"],
-            location["lon"]
+def travel_time_matrix(distances: np.ndarray) -> np.ndarray:
+    return distances * MIN_PER_KM
+
+
+# 좌표를 컬럼으로 붙임 (같은 병원은 1번만 조회)
+# hpid가 있으면 정적 정보 좌표 우선, 없으면 병원명으로 카카오 검색
+def add_hospital_coordinates(df: pd.DataFrame, defer_static: bool = False) -> pd.DataFrame:
+    if "hpid" in df.columns:
+        keys = df["hpid"]
+        unique_df = df.drop_duplicates(subset=["hpid"])
+        lats, lons = get_hospital_locations_by_hpid(
+            unique_df["hpid"], unique_df["dutyname"], defer_static=defer_static
         )
+        unique_keys = unique_df["hpid"]
+    else:
+        keys = df["dutyname"]
+        unique_keys = keys.unique()
+        lats, lons = get_hospital_locations(unique_keys)
+
+    df["hospital_lat"] = keys.map(dict(zip(unique_keys, lats))).astype(float)
+    df["hospital_lon"] = keys.map(dict(zip(unique_keys, lons))).astype(float)
+
+    return df
+
+
+# 거리 계산은 haversine_distance 방식으로 계산
+# 시속 30km 일 때를 가정
+def add_distance_features(df, user_lat, user_lon):
 
-        distances.append(round(dist, 2))
-        times.append(round(dist * 2, 1))
+    if df.empty:
+        df["distance_km"] = pd.Series(dtype=float)
+        df["estimated_travel_time_min"] = pd.Series(dtype=float)
+        return df
+
+    # 스냅샷 등에서 좌표가 이미 붙어 있으면 다시 조회하지 않음
+    # (요청 경로이므로 저장소에 없는 정적 정보는 백그라운드 조회만 예약)
+    if "hospital_lat" not in df.columns or "hospital_lon" not in df.columns:
+        df = add_hospital_coordinates(df, defer_static=True)
+
+    dist = haversine_distance_np(
+        user_lat,
+        user_lon,
+        df["hospital_lat"].to_numpy(),
+        df["hospital_lon"].to_numpy()
+    )
 
-    df["distance_km"] = distances
-    df["estimated_travel_time_min"] = times
+    df["distance_km"] = np.round(dist, 2)
+    df["estimated_travel_time_min"] = np.round(dist * MIN_PER_KM, 1)
 
     return df
\ No newline at end of file
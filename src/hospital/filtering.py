@@ -1,4 +1,10 @@
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+
+INT_COLUMNS = ["hvec", "hvicc", "hvccc", "hvcc", "hv9", "hv8"]
+YN_COLUMNS = ["hvventiayn", "hvctayn", "hvmriayn", "hv10", "hv11"]
 
 
 # NaN, None을 안전하게 int 변환
@@ -16,127 +22,135 @@ def ensure_column(df: pd.DataFrame, col: str, default):
     return df
 
 
+# 컬럼 단위 safe_int (이미 숫자형이면 apply 없이 변환)
+def to_int_series(series: pd.Series) -> pd.Series:
+    if is_integer_dtype(series) and not series.hasnans:
+        return series.astype(int)
 
+    if is_float_dtype(series):
+        return series.fillna(0).astype(int)
 
-def filter_hospitals_strict(
-    hospital_df: pd.DataFrame,
-    patient_info: dict
-) -> pd.DataFrame:
-
-    df = hospital_df.copy()
+    return series.map(safe_int).astype(int)
 
-    # 필수 컬럼 보정
-    int_columns = ["hvec", "hvicc", "hvccc", "hvcc", "hv9", "hv8"]
-    yn_columns = ["hvventiayn", "hvctayn", "hvmriayn", "hv10", "hv11"]
 
-    for col in int_columns:
-        df = ensure_column(df, col, 0)
-        df[col] = df[col].apply(safe_int)
+# Y/N 컬럼 → bool (파서가 이미 bool로 만든 컬럼은 그대로, 문자열은 "Y"만 True)
+def to_bool_series(series: pd.Series) -> pd.Series:
+    if is_bool_dtype(series):
+        return series.astype(bool)
 
-    for col in yn_columns:
-        df = ensure_column(df, col, "N")
+    return series.map(lambda v: v == "Y" or v is True or v is np.True_).astype(bool)
 
-    # 1. 응급실 필수
-    df = df[df["hvec"] > 0]
 
-    # 2. ICU 필요 여부
-    if patient_info["required_resources"]["need_icu"]:
-        df = df[df["hvicc"] > 0]
+# 필터링에 쓰는 컬럼을 한 번만 보정 (int / bool 변환 + 없는 컬럼 생성)
+def normalize_filter_columns(hospital_df: pd.DataFrame) -> pd.DataFrame:
+    df = hospital_df.copy()
 
-    # 3. 인공호흡기
-    if patient_info["required_resources"]["need_ventilator"]:
-        df = df[df["hvventiayn"] == "Y"]
+    for col in INT_COLUMNS:
+        df = ensure_column(df, col, 0)
+        df[col] = to_int_series(df[col])
 
-    # 4. CT / MRI
-    if patient_info["required_resources"]["need_ct"]:
-        df = df[df["hvctayn"] == "Y"]
+    for col in YN_COLUMNS:
+        df = ensure_column(df, col, False)
+        df[col] = to_bool_series(df[col])
 
-    if patient_info["required_resources"]["need_mri"]:
-        df = df[df["hvmriayn"] == "Y"]
+    return df
 
-    # 5. 질환별 조건
-    condition = patient_info["suspected_condition"]
 
+# 질환별 조건 mask
+def condition_mask(df: pd.DataFrame, condition: str) -> pd.Series:
     if condition == "CARDIAC":
-        df = df[df["hvccc"] > 0]
+        return df["hvccc"] > 0
 
     elif condition == "RESPIRATORY":
-        df = df[df["hvventiayn"] == "Y"]
+        return df["hvventiayn"]
 
     elif condition == "NEURO":
-        df = df[df["hvcc"] > 0]
+        return df["hvcc"] > 0
 
     elif condition == "TRAUMA":
-        df = df[df["hv9"] > 0]
+        return df["hv9"] > 0
 
     elif condition == "BURN":
-        df = df[df["hv8"] > 0]
+        return df["hv8"] > 0
 
     elif condition == "PEDIATRIC":
-        df = df[(df["hv10"] == "Y") | (df["hv11"] == "Y")]
+        return df["hv10"] | df["hv11"]
 
-    return df.reset_index(drop=True)
+    return pd.Series(True, index=df.index)
+
+
+# 단계별 통과 여부 mask (정규화된 df 기준)
+# level 3: 응급실 / level 2: + 인공호흡기·CT·MRI / level 1: + ICU / level 0: + 질환 조건
+def filter_level_masks(df: pd.DataFrame, patient_info: dict) -> list[pd.Series]:
+    resources = patient_info["required_resources"]
+    every = pd.Series(True, index=df.index)
+
+    # 1. 응급실 필수
+    level3 = df["hvec"] > 0
+
+    # 3. 인공호흡기 / 4. CT / MRI
+    level2 = level3.copy()
+    if resources["need_ventilator"]:
+        level2 &= df["hvventiayn"]
+    if resources["need_ct"]:
+        level2 &= df["hvctayn"]
+    if resources["need_mri"]:
+        level2 &= df["hvmriayn"]
+
+    # 2. ICU 필요 여부
+    icu_ok = (df["hvicc"] > 0) if resources["need_icu"] else every
+    level1 = level2 & icu_ok
+
+    # 5. 질환별 조건
+    level0 = level1 & condition_mask(df, patient_info["suspected_condition"])
+
+    return [level0, level1, level2, level3]
+
+
+def filter_hospitals_strict(
+    hospital_df: pd.DataFrame,
+    patient_info: dict
+) -> pd.DataFrame:
+
+    df = normalize_filter_columns(hospital_df)
+    level0 = filter_level_masks(df, patient_info)[0]
+
+    return df[level0].reset_index(drop=True)
 
 
 # 단계별로 필터링을 완화하며, 병원별 최초 통과 filter_level을 기록하여 반환
+# 한 번의 정규화 + mask 계산으로 모든 병원의 최소 filter_level을 한 번에 부여
 def filter_hospitals(
     hospital_df: pd.DataFrame,
     patient_info: dict,
     min_candidates: int = 5
 ) -> pd.DataFrame:
 
+    if hospital_df.empty:
+        return pd.DataFrame()
+
+    df = normalize_filter_columns(hospital_df)
+    masks = filter_level_masks(df, patient_info)
 
-    collected = []
-    seen_hpid = set()
-
-    # Level 0: 완전 매칭
-    df0 = filter_hospitals_strict(hospital_df, patient_info)
-    if not df0.empty:
-        df0 = df0.copy()
-        df0["filter_level"] = 0
-        collected.append(df0)
-        seen_hpid.update(df0["hpid"])
-
-    # Level 1: 질환 조건 완화
-    relaxed_info_1 = patient_info.copy()
-    relaxed_info_1["suspected_condition"] = "UNKNOWN"
-
-    df1 = filter_hospitals_strict(hospital_df, relaxed_info_1)
-    df1 = df1[~df1["hpid"].isin(seen_hpid)]
-
-    if not df1.empty:
-        df1 = df1.copy()
-        df1["filter_level"] = 1
-        collected.append(df1)
-        seen_hpid.update(df1["hpid"])
-
-    # Level 2: ICU 요구 완화
-    relaxed_info_2 = relaxed_info_1.copy()
-    relaxed_info_2["required_resources"]["need_icu"] = False
-
-    df2 = filter_hospitals_strict(hospital_df, relaxed_info_2)
-    df2 = df2[~df2["hpid"].isin(seen_hpid)]
-
-    if not df2.empty:
-        df2 = df2.copy()
-        df2["filter_level"] = 2
-        collected.append(df2)
-        seen_hpid.update(df2["hpid"])
-
-    # Level 3: 응급실만 있으면 OK
-    df3 = hospital_df.copy()
-    df3 = ensure_column(df3, "hvec", 0)
-    df3["hvec"] = df3["hvec"].apply(safe_int)
-    df3 = df3[df3["hvec"] > 0]
-    df3 = df3[~df3["hpid"].isin(seen_hpid)]
-
-    if not df3.empty:
-        df3 = df3.copy()
-        df3["filter_level"] = 3
-        collected.append(df3)
-
-    if not collected:
+    levels = np.select(
+        [m.to_numpy() for m in masks],
+        [0, 1, 2, 3],
+        default=-1
+    )
+
+    keep = levels >= 0
+    if not keep.any():
         return pd.DataFrame()
 
-    result = pd.concat(collected).reset_index(drop=True)
-    return result
\ No newline at end of file
+    result = df[keep].copy()
+    result["filter_level"] = levels[keep]
+
+    # 같은 hpid가 여러 행이면 가장 낮은 level의 행만 남김
+    if "hpid" in result.columns and result["hpid"].duplicated().any():
+        min_level = result.groupby("hpid")["filter_level"].transform("min")
+        result = result[result["filter_level"] == min_level]
+
+    # level 순으로, 같은 level 안에서는 원래 순서 유지
+    result = result.sort_values("filter_level", kind="stable")
+
+    return result.reset_index(drop=True)
\ No newline at end of file
@@ -1,8 +1,22 @@
 import json
 import os
-import requests
+import threading
+from array import array
+
+import numpy as np
 from dotenv import load_dotenv
 
+from src.opendata.static_cache import get_static_info_many
+from src.utils.http_client import http_get
+from src.utils.append_log import (
+    append_records,
+    atomic_write_json,
+    file_lock,
+    journal_generation,
+    read_journal,
+    rotate_journal,
+)
+
 load_dotenv()
 
 KAKAO_API_KEY = os.getenv("KAKAO_REST_API_KEY")
@@ -15,6 +29,8 @@ PROJECT_ROOT = os.path.abspath(
 
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 CACHE_PATH = os.path.join(DATA_DIR, "hospital_location_cache.json")
+# 새로 조회한 좌표는 JSON 전체를 다시 쓰지 않고 이 파일에 한 줄씩 추가
+JOURNAL_PATH = os.path.join(DATA_DIR, "hospital_location_cache.jsonl")
 
 
 
@@ -27,8 +43,136 @@ def load_cache() -> dict:
 
 
 def save_cache(cache: dict):
-    with open(CACHE_PATH, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    atomic_write_json(CACHE_PATH, cache)
+
+
+
+# 프로세스 전역 좌표 저장소 (1회 로드, key → index, 위/경도는 연속 배열)
+class LocationStore:
+
+    def __init__(self, cache_path: str = CACHE_PATH, journal_path: str = JOURNAL_PATH):
+        self.cache_path = cache_path
+        self.journal_path = journal_path
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._journal_position = None
+
+        self._index: dict[str, int] = {}
+        self._lats = array("d")
+        self._lons = array("d")
+
+    def _put(self, key: str, lat: float, lon: float):
+        i = self._index.get(key)
+        if i is None:
+            self._index[key] = len(self._lats)
+            self._lats.append(lat)
+            self._lons.append(lon)
+        else:
+            self._lats[i] = lat
+            self._lons[i] = lon
+
+    def _load_base(self):
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                for key, loc in json.load(f).items():
+                    self._put(key, float(loc["lat"]), float(loc["lon"]))
+
+    # 다른 워커가 journal에 추가한 좌표 반영
+    # 그 사이 다른 워커가 compact했으면 마지막 반영 이후 좌표는 JSON 캐시로 옮겨졌으므로 캐시부터 다시 읽음
+    def _sync_journal(self):
+        position = self._journal_position
+        if position is not None and position[0] != journal_generation(self.journal_path):
+            self._load_base()
+
+        records, self._journal_position = read_journal(self.journal_path, position)
+        for r in records:
+            self._put(r["key"], float(r["lat"]), float(r["lon"]))
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+
+        # 캐시를 읽기 전의 세대를 기록 → 읽는 도중 compact되면 다음 반영 때 다시 읽음
+        self._journal_position = (journal_generation(self.journal_path), 0)
+        self._load_base()
+
+        self._sync_journal()
+        self._loaded = True
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._index)
+
+    def get(self, key: str, refresh: bool = False) -> dict | None:
+        with self._lock:
+            self._ensure_loaded()
+
+            if refresh and key not in self._index:
+                self._sync_journal()
+
+            i = self._index.get(key)
+            if i is None:
+                return None
+
+            return {"lat": self._lats[i], "lon": self._lons[i]}
+
+    # 여러 key를 한 번에 조회 (없는 key는 NaN)
+    def get_many(self, keys) -> tuple[np.ndarray, np.ndarray]:
+        with self._lock:
+            self._ensure_loaded()
+
+            idx = np.fromiter(
+                (self._index.get(k, -1) for k in keys),
+                dtype=np.int64
+            )
+            lats = np.frombuffer(self._lats, dtype=np.float64)
+            lons = np.frombuffer(self._lons, dtype=np.float64)
+
+            found = idx >= 0
+            out_lat = np.full(len(idx), np.nan)
+            out_lon = np.full(len(idx), np.nan)
+            out_lat[found] = lats[idx[found]]
+            out_lon[found] = lons[idx[found]]
+
+            return out_lat, out_lon
+
+    def put(self, key: str, lat: float, lon: float):
+        append_records(
+            self.journal_path,
+            [{"key": key, "lat": lat, "lon": lon}]
+        )
+
+        with self._lock:
+            self._ensure_loaded()
+            self._put(key, lat, lon)
+
+    # journal 내용을 JSON 캐시에 합치고 journal 비우기 (atomic rename)
+    def compact(self):
+        with file_lock(self.journal_path):
+            cache = {}
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            r = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        cache[r["key"]] = {"lat": r["lat"], "lon": r["lon"]}
+
+            atomic_write_json(self.cache_path, cache)
+            rotate_journal(self.journal_path)
+
+        with self._lock:
+            self._journal_position = None
+
+
+location_store = LocationStore()
 
 
 
@@ -43,13 +187,12 @@ def fetch_location_from_kakao(hospital_name: str) -> dict | None:
         "size": 1
     }
 
-    response = requests.get(
+    response = http_get(
         KAKAO_SEARCH_URL,
         headers=headers,
         params=params,
         timeout=5
     )
-    response.raise_for_status()
 
     documents = response.json().get("documents", [])
 
@@ -64,21 +207,81 @@ def fetch_location_from_kakao(hospital_name: str) -> dict | None:
 
 # 외부에서 쓰는 메인 함수
 def get_hospital_location(hospital_name: str) -> dict | None:
-    cache = load_cache()
 
-    # 캐시에 있으면 바로 반환
-    if hospital_name in cache:
-        return cache[hospital_name]
+    # 캐시에 있으면 바로 반환 (메모리 → 다른 워커가 추가한 journal 순)
+    location = location_store.get(hospital_name, refresh=True)
+    if location:
+        return location
 
     # 없으면 카카오 API 호출
     location = fetch_location_from_kakao(hospital_name)
 
     if location:
-        cache[hospital_name] = location
-        save_cache(cache)
+        location_store.put(hospital_name, location["lat"], location["lon"])
 
     return location
 
+
+# 여러 병원 좌표를 배열로 조회 (캐시에 없는 병원만 카카오 API 호출)
+def get_hospital_locations(hospital_names) -> tuple[np.ndarray, np.ndarray]:
+    hospital_names = list(hospital_names)
+    lats, lons = location_store.get_many(hospital_names)
+
+    for i in np.flatnonzero(np.isnan(lats)):
+        location = get_hospital_location(hospital_names[i])
+        if location:
+            lats[i] = location["lat"]
+            lons[i] = location["lon"]
+
+    return lats, lons
+
+
+
+def _to_coord(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+# 정적 병원 정보(wgs84 좌표)를 hpid로 조회 → (위도 배열, 경도 배열), 좌표가 없으면 NaN
+# defer_static이면 저장소에 없는 병원은 백그라운드 조회만 예약 (get_static_info_many 참고)
+def get_static_coordinates(hpids, defer_static: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    records = get_static_info_many(hpids, defer_missing=defer_static)
+
+    lats = np.array(
+        [_to_coord((r or {}).get("total_wgs84lat")) for r in records],
+        dtype=float
+    )
+    lons = np.array(
+        [_to_coord((r or {}).get("total_wgs84lon")) for r in records],
+        dtype=float
+    )
+
+    return lats, lons
+
+
+# hpid 기준 좌표 조회: 정적 정보 좌표 우선, 없는 병원만 병원명으로 카카오 검색
+def get_hospital_locations_by_hpid(
+    hpids,
+    hospital_names,
+    defer_static: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+
+    hospital_names = list(hospital_names)
+    lats, lons = get_static_coordinates(hpids, defer_static=defer_static)
+
+    missing = np.flatnonzero(np.isnan(lats) | np.isnan(lons))
+    if len(missing):
+        fallback_lats, fallback_lons = get_hospital_locations(
+            [hospital_names[i] for i in missing]
+        )
+        lats[missing] = fallback_lats
+        lons[missing] = fallback_lons
+
+    return lats, lons
+
+
 if __name__ == "__main__":
     test_hospitals = [
         "삼성서울병원",
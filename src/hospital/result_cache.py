@@ -0,0 +1,111 @@
+import copy
+import threading
+from datetime import datetime
+
+from cachetools import TTLCache
+
+from config import RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SEC
+from src.opendata.snapshot import snapshot_version
+from src.utils.geocode import grid_cell
+
+SEVERITIES = {"LOW", "MEDIUM", "HIGH"}
+RESOURCE_KEYS = ["need_icu", "need_ventilator", "need_ct", "need_mri"]
+
+# 모델 입력인 confidence는 소수 둘째 자리까지만 구분
+CONFIDENCE_DIGITS = 2
+
+
+# 추천 결과에 영향을 주는 환자 정보만 정규화해서 tuple로
+def normalize_patient_info(patient_info: dict) -> tuple:
+    severity = str(patient_info.get("severity", "")).upper()
+    condition = str(patient_info.get("suspected_condition", "UNKNOWN")).upper()
+    resources = patient_info.get("required_resources") or {}
+
+    try:
+        confidence = round(float(patient_info.get("confidence", 0.0)), CONFIDENCE_DIGITS)
+    except (TypeError, ValueError):
+        confidence = 0.0
+
+    return (
+        severity if severity in SEVERITIES else "MEDIUM",
+        condition,
+        tuple(bool(resources.get(k, False)) for k in RESOURCE_KEYS),
+        confidence,
+    )
+
+
+# 캐시 key: (위치 격자, 환자 정보, 시간 feature 구간)
+# 스냅샷 버전은 캐시 전체에 걸려 있어서 새 스냅샷이 올라오면 비움
+def recommendation_cache_key(
+    user_lat: float,
+    user_lon: float,
+    patient_info: dict,
+    now: datetime | None = None
+) -> tuple:
+
+    now = now or datetime.now()
+
+    return (
+        grid_cell(user_lat, user_lon),
+        normalize_patient_info(patient_info),
+        now.hour,
+        now.weekday() >= 5,
+    )
+
+
+# 후보 탐색 + 추천 결과 캐시 (TTL + 최대 개수, 스냅샷 버전이 바뀌면 전체 무효화)
+class RecommendationCache:
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL_SEC):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._version = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def _check_version(self, version: int):
+        if version != self._version:
+            self._cache.clear()
+            self._version = version
+
+    # 결과 계산 전에 key와 함께 버전을 읽어 두었다가 put에 넘김
+    # (계산 중에 스냅샷이 바뀌면 그 결과는 이전 버전으로 저장되어 바로 버려짐)
+    def get(self, key: tuple, version: int | None = None):
+        version = snapshot_version() if version is None else version
+
+        with self._lock:
+            self._check_version(version)
+            value = self._cache.get(key)
+
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return copy.deepcopy(value)
+
+    def put(self, key: tuple, value, version: int):
+        with self._lock:
+            if version != self._version:
+                return
+            self._cache[key] = copy.deepcopy(value)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "snapshot_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+recommendation_cache = RecommendationCache()
\ No newline at end of file
@@ -1,64 +1,235 @@
-import os
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import numpy as np
 import pandas as pd
 
+from config import (
+    DISTRICT_SEARCH_CONCURRENCY,
+    DISTRICT_SEARCH_TIMEOUT_SEC,
+    REGION_TIMEOUT_SEC,
+)
 from src.utils.region import get_search_districts
 from src.opendata.fetch_hospital_api import fetch_emergency_data
-from src.opendata.fetch_hospital_static_api import fetch_hospital_static_by_hpid
+from src.opendata.static_cache import get_static_info_many
+from src.opendata.snapshot import get_city_snapshot, loaded_snapshots
 from src.hospital.filtering import filter_hospitals
 from src.hospital.distance import add_distance_features
-from src.utils.geocode import latlon_to_region
+from src.utils.geocode import latlon_to_region, latlon_to_region_async
+
+# 반경 기반 후보 탐색: 후보가 min_candidates 미만이면 반경을 넓혀 재탐색
+# (마지막 None = 메모리에 있는 스냅샷 전체)
+SEARCH_RADII_KM = [5, 10, 20, 40, None]
+
+# 추천 단계(recommend_from_matrix)에서 남기는 filter_level 상한
+# 반경 확장 여부도 이 단계까지 통과한 병원 수로 판단 (level 3 = 응급실만 있는 병원)
+MAX_FILTER_LEVEL = 2
+
+
+# 정적 병원 정보 병합 (hpid 단위, 정적 정보 저장소에서 일괄 조회)
+# 요청 경로에서는 정적 정보 API를 기다리지 않음: 저장소에 없는 병원은 백그라운드 조회만 예약하고
+# 이번 요청에서는 정적 정보 없이 진행 (병상 수 등은 feature_builder 기본값)
+def merge_static_info(filtered_df: pd.DataFrame) -> pd.DataFrame:
+    static_rows = [
+        static_info or {}
+        for static_info in get_static_info_many(filtered_df["hpid"], defer_missing=True)
+    ]
+
+    static_part_df = pd.DataFrame(static_rows)
+
+    if not static_part_df.empty:
+        filtered_df = pd.concat(
+            [
+                filtered_df.reset_index(drop=True),
+                static_part_df.reset_index(drop=True)
+            ],
+            axis=1
+        )
 
-# 정적 병원 정보 CSV 경로
-PROJECT_ROOT = os.path.abspath(
-    os.path.join(os.path.dirname(__file__), "../../")
-)
-STATIC_CSV_PATH = os.path.join(PROJECT_ROOT, "data", "hospital_static.csv")
+    return filtered_df
 
 
-# 정적 병원 정보 캐시 로드
-def load_hospital_static_cache() -> pd.DataFrame:
-    if not os.path.exists(STATIC_CSV_PATH):
-        return pd.DataFrame()
+# 필터링 이후 공통 처리: 거리 feature + 결측 좌표 제거 + 정적 정보 병합
+def finish_candidates(
+    filtered_df: pd.DataFrame,
+    user_lat: float,
+    user_lon: float
+) -> pd.DataFrame:
 
-    try:
-        df = pd.read_csv(STATIC_CSV_PATH)
-        df.columns = df.columns.str.lower()
-        return df
-    except Exception:
+    # 거리 / 시간 feature
+    filtered_df = add_distance_features(
+        filtered_df,
+        user_lat=user_lat,
+        user_lon=user_lon
+    )
+
+    filtered_df = filtered_df.dropna(
+        subset=["distance_km", "estimated_travel_time_min"]
+    )
+
+    if filtered_df.empty:
+        return filtered_df
+
+    return merge_static_info(filtered_df)
+
+
+# 스냅샷 공간 인덱스로 사용자 주변 병원만 추려서 필터링
+# 후보가 부족하면 반경을 넓히며, 메모리에 있는 다른 시 스냅샷도 함께 탐색 (시 경계 보완)
+def search_by_radius(
+    snapshots: list,
+    city: str,
+    district: str,
+    patient_info: dict,
+    user_lat: float,
+    user_lon: float,
+    min_candidates: int = 5,
+    max_filter_level: int = MAX_FILTER_LEVEL
+) -> pd.DataFrame:
+
+    filtered_df = pd.DataFrame()
+
+    for radius_km in SEARCH_RADII_KM:
+        frames = [
+            snap.nearby_frame(user_lat, user_lon, radius_km).assign(city=snap.city)
+            for snap in snapshots
+        ]
+        frames = [f for f in frames if not f.empty]
+
+        if not frames:
+            continue
+
+        nearby_df = pd.concat(frames, ignore_index=True)
+        nearby_df = nearby_df.drop_duplicates(subset=["hpid"])
+
+        # 환자 조건 필터링
+        filtered_df = filter_hospitals(nearby_df, patient_info)
+
+        # 필요한 장비(CT / 인공호흡기 / MRI)가 있는 병원이 충분할 때만 멈춤
+        usable = (filtered_df["filter_level"] <= max_filter_level).sum() if not filtered_df.empty else 0
+        if usable >= min_candidates:
+            break
+
+    if filtered_df.empty:
+        return filtered_df
+
+    # 같은 구 0 / 같은 시 1 / 다른 시 2
+    same_city = filtered_df["city"] == city
+    same_district = same_city & (filtered_df["district"] == district)
+
+    filtered_df["district_level"] = np.select(
+        [same_district, same_city], [0, 1], default=2
+    )
+    filtered_df["same_district"] = same_district.astype(int)
+
+    return filtered_df.drop(columns=["city"])
+
+
+# 구 1곳 처리: 실시간 API 조회 → 환자 조건 필터링 → 거리 feature (스레드에서 실행)
+def search_one_district(
+    city: str,
+    target_district: str,
+    district_level: int,
+    patient_info: dict,
+    user_lat: float,
+    user_lon: float
+) -> pd.DataFrame:
+
+    # 실시간 응급 데이터
+    hospital_df = fetch_emergency_data(
+        stage1=city,
+        stage2=target_district
+    )
+
+    if hospital_df.empty:
         return pd.DataFrame()
 
+    # 환자 조건 필터링
+    filtered_df = filter_hospitals(hospital_df, patient_info)
+
+    if filtered_df.empty:
+        return filtered_df
 
-def save_hospital_static_cache(df: pd.DataFrame):
-    os.makedirs(os.path.dirname(STATIC_CSV_PATH), exist_ok=True)
-    df.to_csv(STATIC_CSV_PATH, index=False, encoding="utf-8-sig")
+    filtered_df["district_level"] = district_level
+    filtered_df["same_district"] = 1 if district_level == 0 else 0
 
+    # 거리 / 시간 feature
+    filtered_df = add_distance_features(
+        filtered_df,
+        user_lat=user_lat,
+        user_lon=user_lon
+    )
+
+    return filtered_df.dropna(
+        subset=["distance_km", "estimated_travel_time_min"]
+    )
 
-# hpid 기준 정적 정보 조회
-def get_static_info_by_hpid(
-    hpid: str,
-    static_df: pd.DataFrame
-) -> tuple[dict | None, pd.DataFrame]:
 
-    if not static_df.empty and "total_hpid" in static_df.columns:
-        hit = static_df[static_df["total_hpid"] == hpid]
-        if not hit.empty:
-            return hit.iloc[0].to_dict(), static_df
+# 스냅샷을 쓸 수 없을 때: 구 단위로 실시간 API를 동시에 호출하며 탐색
+# 결과는 완료 순서와 무관하게 탐색 목록 순서(district_level 순)로 합침
+def search_by_district(
+    city: str,
+    district: str,
+    patient_info: dict,
+    user_lat: float,
+    user_lon: float
+) -> pd.DataFrame:
 
-    #  캐시에 없음 → API 호출
-    static_info = fetch_hospital_static_by_hpid(hpid)
-    if static_info is None:
-        return None, static_df
+    # 탐색할 구 + district_level 목록
+    search_targets = get_search_districts(city, district)
 
-    new_df = pd.DataFrame([static_info])
-    updated_df = (
-        pd.concat([static_df, new_df], ignore_index=True)
-        if not static_df.empty
-        else new_df
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(DISTRICT_SEARCH_CONCURRENCY, len(search_targets)))
     )
+    futures = [
+        executor.submit(
+            search_one_district,
+            city,
+            target_district,
+            district_level,
+            patient_info,
+            user_lat,
+            user_lon,
+        )
+        for target_district, district_level in search_targets
+    ]
 
-    save_hospital_static_cache(updated_df)
+    # 전체 마감 시간 안에 끝난 구만 사용 (남은 작업은 기다리지 않음)
+    deadline = time.monotonic() + DISTRICT_SEARCH_TIMEOUT_SEC
+    all_results = []
+    seen_hpid = set()
 
-    return static_info, updated_df
+    try:
+        for (target_district, _), future in zip(search_targets, futures):
+            try:
+                filtered_df = future.result(
+                    timeout=max(0.0, deadline - time.monotonic())
+                )
+            except FutureTimeoutError:
+                print(f"[WARN] District search timed out: {city} {target_district}")
+                continue
+            except Exception as e:
+                print(f"[WARN] District search failed: {city} {target_district}: {e}")
+                continue
+
+            if filtered_df.empty:
+                continue
+
+            # 중복 병원 제거
+            filtered_df = filtered_df[~filtered_df["hpid"].isin(seen_hpid)]
+            seen_hpid.update(filtered_df["hpid"])
+
+            all_results.append(filtered_df)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if not all_results:
+        return pd.DataFrame()
+
+    result_df = pd.concat(all_results).reset_index(drop=True)
+
+    # 정적 정보 병합은 중복 제거 후 1번 (없는 hpid는 백그라운드 조회)
+    return merge_static_info(result_df)
 
 
 # 메인 함수
@@ -67,7 +238,8 @@ def search_nearby_hospitals(
     district: str | None,
     patient_info: dict,
     user_lat: float,
-    user_lon: float
+    user_lon: float,
+    min_candidates: int = 5
 ) -> pd.DataFrame:
 
     # 0. 위경도 → 시/구 변환
@@ -78,76 +250,127 @@ def search_nearby_hospitals(
             print(f"[ERROR] Failed to resolve region from lat/lon: {e}")
             return pd.DataFrame()
 
-    all_results = []
-    seen_hpid = set()
-
-    # 정적 병원 정보 캐시 (1회 로드)
-    static_df = load_hospital_static_cache()
+    # 시 단위 실시간 스냅샷 (구별 API 호출 대신 1회 조회 후 메모리에서 분배)
+    try:
+        snapshot = get_city_snapshot(city)
+    except Exception as e:
+        print(f"[WARN] Failed to load city snapshot, falling back to per-district fetch: {e}")
+        snapshot = None
+
+    if snapshot is not None and snapshot.spatial_index is not None and len(snapshot.spatial_index):
+        snapshots = [snapshot] + [
+            s for s in loaded_snapshots() if s.city != city
+        ]
+
+        filtered_df = search_by_radius(
+            snapshots,
+            city=city,
+            district=district,
+            patient_info=patient_info,
+            user_lat=user_lat,
+            user_lon=user_lon,
+            min_candidates=min_candidates,
+        )
 
-    # 탐색할 구 + district_level 목록
-    search_targets = get_search_districts(city, district)
+        if filtered_df.empty:
+            return pd.DataFrame()
 
-    for target_district, district_level in search_targets:
-        # 실시간 응급 데이터
-        hospital_df = fetch_emergency_data(
-            stage1=city,
-            stage2=target_district
-        )
+        result_df = finish_candidates(filtered_df, user_lat, user_lon)
 
-        if hospital_df.empty:
-            continue
+        if result_df.empty:
+            return pd.DataFrame()
 
-        # 환자 조건 필터링
-        filtered_df = filter_hospitals(hospital_df, patient_info)
+        return result_df.sort_values(
+            ["district_level", "distance_km"], kind="stable"
+        ).reset_index(drop=True)
 
-        if filtered_df.empty:
-            continue
+    return search_by_district(
+        city, district, patient_info, user_lat, user_lon
+    )
 
-        filtered_df = filtered_df.copy()
-        filtered_df["district_level"] = district_level
-        filtered_df["same_district"] = 1 if district_level == 0 else 0
 
-        # 거리 / 시간 feature
-        filtered_df = add_distance_features(
-            filtered_df,
-            user_lat=user_lat,
-            user_lon=user_lon
-        )
+# 위경도 → 시/구 변환 + 해당 시 스냅샷 준비 (환자 정보와 무관하므로 LLM 파싱과 병렬 실행 가능)
+async def prepare_search_region_async(
+    user_lat: float,
+    user_lon: float
+) -> tuple[str, str]:
 
-        filtered_df = filtered_df.dropna(
-            subset=["distance_km", "estimated_travel_time_min"]
-        )
+    city, district = await asyncio.wait_for(
+        latlon_to_region_async(user_lat, user_lon),
+        timeout=REGION_TIMEOUT_SEC
+    )
 
-        if filtered_df.empty:
-            continue
+    # 스냅샷이 없거나 오래됐으면 미리 갱신 (갱신은 워커 스레드에서)
 
-        # 정적 병원 정보 병합 (hpid 단위)
-        static_rows = []
+    try:
+        await asyncio.to_thread(get_city_snapshot, city)
+    except Exception as e:
+        print(f"[WARN] Failed to prepare city snapshot: {e}")
 
-        for _, row in filtered_df.iterrows():
-            static_info, static_df = get_static_info_by_hpid(
-                row["hpid"], static_df
-            )
-            static_rows.append(static_info or {})
+    return city, district
 
-        static_part_df = pd.DataFrame(static_rows)
 
-        if not static_part_df.empty:
-            filtered_df = pd.concat(
-                [
-                    filtered_df.reset_index(drop=True),
-                    static_part_df.reset_index(drop=True)
-                ],
-                axis=1
-            )
+# 비동기 버전: 지역 변환은 비동기로, 필터링/거리 계산은 워커 스레드에서 실행
+async def search_nearby_hospitals_async(
+    city: str | None,
+    district: str | None,
+    patient_info: dict,
+    user_lat: float,
+    user_lon: float,
+    min_candidates: int = 5
+) -> pd.DataFrame:
 
-        # 중복 병원 제거
-        filtered_df = filtered_df[~filtered_df["hpid"].isin(seen_hpid)]
-        seen_hpid.update(filtered_df["hpid"])
+    if not city or not district:
+        try:
+            city, district = await prepare_search_region_async(user_lat, user_lon)
+        except Exception as e:
+            print(f"[ERROR] Failed to resolve region from lat/lon: {e}")
+            return pd.DataFrame()
 
-        all_results.append(filtered_df)
+    return await asyncio.to_thread(
+        search_nearby_hospitals,
+        city,
+        district,
+        patient_info,
+        user_lat,
+        user_lon,
+        min_candidates,
+    )
 
-    if not all_results:
-        return pd.DataFrame()
 
-    return pd.concat(all_results).reset_index(drop=True)
\ No newline at end of file
+if __name__ == "__main__":
+    from src.hospital.spatial import HospitalSpatialIndex
+    from src.opendata.snapshot import EmergencySnapshot
+
+    # 5km 안에는 응급실만 있는 병원 6곳, 15km 밖에 CT 가능 병원 5곳
+    user_lat, user_lon = 37.5, 127.0
+    rows = [
+        {"hpid": f"ER{i}", "dutyname": f"응급실병원{i}", "hvec": 3, "hvctayn": "N",
+         "hospital_lat": user_lat + 0.01 * (i + 1), "hospital_lon": user_lon, "district": "A구"}
+        for i in range(6)
+    ] + [
+        {"hpid": f"CT{i}", "dutyname": f"CT병원{i}", "hvec": 3, "hvctayn": "Y",
+         "hospital_lat": user_lat + 0.14 + 0.01 * i, "hospital_lon": user_lon, "district": "B구"}
+        for i in range(5)
+    ]
+    df = pd.DataFrame(rows)
+    snap = EmergencySnapshot(
+        city="테스트시",
+        df=df,
+        version=1,
+        fetched_at=time.time(),
+        spatial_index=HospitalSpatialIndex(df["hospital_lat"], df["hospital_lon"]),
+    )
+    patient = {
+        "suspected_condition": "UNKNOWN",
+        "required_resources": {
+            "need_ct": True, "need_ventilator": False, "need_mri": False, "need_icu": False
+        },
+    }
+
+    result = search_by_radius([snap], "테스트시", "A구", patient, user_lat, user_lon)
+    usable = result[result["filter_level"] <= MAX_FILTER_LEVEL]
+
+    print(result[["hpid", "filter_level", "district_level"]])
+    assert len(usable) == 5, "CT가 필요한 환자는 응급실만 있는 병원으로 탐색을 멈추면 안 됨"
+    print("OK: CT 병원이 나올 때까지 반경 확장")
\ No newline at end of file
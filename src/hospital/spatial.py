@@ -0,0 +1,65 @@
+import numpy as np
+from sklearn.neighbors import BallTree
+
+from src.hospital.distance import EARTH_RADIUS_KM
+
+
+# 병원 좌표 공간 인덱스 (haversine BallTree)
+# 반경 R km 이내 / 가장 가까운 K개 병원을 위치(position) 배열로 반환
+class HospitalSpatialIndex:
+
+    def __init__(self, lats, lons):
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+
+        # 좌표가 없는 병원은 인덱스에서 제외 (원래 행 위치는 유지)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        self.positions = np.flatnonzero(valid)
+
+        self._tree = None
+        if len(self.positions):
+            coords = np.radians(np.column_stack([lats[valid], lons[valid]]))
+            self._tree = BallTree(coords, metric="haversine")
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @staticmethod
+    def _point(lat: float, lon: float) -> np.ndarray:
+        return np.radians([[lat, lon]])
+
+    # 반경 이내 병원 (가까운 순)
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+
+        if self._tree is None:
+            return np.array([], dtype=int), np.array([])
+
+        ind, dist = self._tree.query_radius(
+            self._point(lat, lon),
+            r=radius_km / EARTH_RADIUS_KM,
+            return_distance=True,
+            sort_results=True,
+        )
+
+        return self.positions[ind[0]], dist[0] * EARTH_RADIUS_KM
+
+    # 가장 가까운 K개 병원
+    def query_nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+
+        if self._tree is None:
+            return np.array([], dtype=int), np.array([])
+
+        k = min(k, len(self.positions))
+        dist, ind = self._tree.query(self._point(lat, lon), k=k)
+
+        return self.positions[ind[0]], dist[0] * EARTH_RADIUS_KM
\ No newline at end of file
@@ -3,7 +3,7 @@ import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from config import LLM_API_KEY
 
 # 환경 변수 로드
@@ -12,9 +12,17 @@ load_dotenv()
 if not LLM_API_KEY:
     raise RuntimeError("GEMMA_API_KEY not found")
 
+LLM_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
 client = OpenAI(
     api_key=LLM_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+    base_url=LLM_BASE_URL
+)
+
+# 비동기 API 엔드포인트용 (이벤트 루프를 막지 않음)
+async_client = AsyncOpenAI(
+    api_key=LLM_API_KEY,
+    base_url=LLM_BASE_URL
 )
 
 MODEL_NAME = "models/gemma-3-4b-it"
@@ -78,30 +86,48 @@ def extract_json(text: str) -> str:
 
     raise ValueError("JSON 영역을 찾을 수 없습니다.")
 
-# Gemma 파싱 함수
+# 프롬프트 생성 / 응답 파싱 (동기·비동기 공통)
 
-def parse_emergency_text(user_input: str) -> dict:
-    full_prompt = SYSTEM_PROMPT + "\n\n" + USER_PROMPT_TEMPLATE.format(
+def build_parse_prompt(user_input: str) -> str:
+    return SYSTEM_PROMPT + "\n\n" + USER_PROMPT_TEMPLATE.format(
         user_input=user_input
     )
 
+
+def parse_llm_output(raw_text: str) -> dict:
+    json_text = extract_json(raw_text.strip())
+
+    try:
+        parsed = json.loads(json_text)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"JSON 파싱 실패:\n{json_text}") from e
+
+    return parsed
+
+# Gemma 파싱 함수
+
+def parse_emergency_text(user_input: str) -> dict:
     response = client.chat.completions.create(
         model=MODEL_NAME,
         messages=[
-            {"role": "user", "content": full_prompt}
+            {"role": "user", "content": build_parse_prompt(user_input)}
         ],
         temperature=0.2
     )
 
-    raw_text = response.choices[0].message.content.strip()
-    json_text = extract_json(raw_text)
+    return parse_llm_output(response.choices[0].message.content)
 
-    try:
-        parsed = json.loads(json_text)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"JSON 파싱 실패:\n{json_text}") from e
 
-    return parsed
+async def parse_emergency_text_async(user_input: str) -> dict:
+    response = await async_client.chat.completions.create(
+        model=MODEL_NAME,
+        messages=[
+            {"role": "user", "content": build_parse_prompt(user_input)}
+        ],
+        temperature=0.2
+    )
+
+    return parse_llm_output(response.choices[0].message.content)
 
 # 테스트 실행
 
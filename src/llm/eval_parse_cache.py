@@ -0,0 +1,107 @@
+# 파싱 캐시 유사 문장 적중 기준 검증
+# 한국어 응급 문장 쌍(의미가 같은 쌍 / 거의 같지만 의미가 다른 쌍)의 임베딩 유사도로
+# threshold별 오적중률(의미가 다른데 적중) / 적중률(의미가 같은데 적중)을 규칙 검사 전후로 비교
+# 실행: python -m src.llm.eval_parse_cache
+
+import numpy as np
+
+from config import PARSE_CACHE_SIMILARITY
+from src.llm.parse_cache import embed_text, normalize_text
+from src.ml.triage import rule_triage
+from src.rag.retriever import warmup_retriever
+
+THRESHOLDS = [0.85, 0.90, 0.93, 0.95, 0.97, 0.99]
+
+# (문장 A, 문장 B, 같은 의미인지)
+# 의미가 다른 쌍: 부위 / 대상 / 중증도 / 원인만 다르고 나머지 표현은 같은 문장
+NEAR_MISS_PAIRS = [
+    ("어떤 남자가 흉부에 칼을 찔려서 쓰러져있습니다.", "어떤 남자가 복부에 칼을 찔려서 쓰러져있습니다.", False),
+    ("아버지가 가슴 통증을 호소하며 쓰러졌어요", "아버지가 복부 통증을 호소하며 쓰러졌어요", False),
+    ("아이가 뜨거운 물에 데었어요", "아이가 뜨거운 물을 삼켰어요", False),
+    ("할머니가 의식을 잃었어요", "할머니가 의식은 있어요", False),
+    ("친구가 숨을 못 쉬어요", "친구가 숨은 쉬어요", False),
+    ("남편이 계단에서 떨어졌는데 의식이 없어요", "남편이 계단에서 떨어졌는데 의식은 있어요", False),
+    ("아기가 열이 나고 경련을 해요", "아기가 열이 나고 기침을 해요", False),
+    ("어머니가 농약을 마셨어요", "어머니가 술을 마셨어요", False),
+    ("동료가 오른쪽 팔이 마비됐어요", "동료가 오른쪽 팔이 골절됐어요", False),
+    ("손가락을 칼에 살짝 베였어요", "목을 칼에 깊게 베였어요", False),
+    ("어떤 남자가 흉부에 칼을 찔려서 쓰러져있습니다.", "어떤 남자가 가슴에 칼에 찔려 쓰러져 있어요", True),
+    ("아버지가 가슴 통증을 호소하며 쓰러졌어요", "아버지가 가슴이 아프다며 쓰러졌습니다", True),
+    ("아이가 뜨거운 물에 데었어요", "아이가 뜨거운 물에 데었습니다", True),
+    ("할머니가 의식을 잃었어요", "할머니가 갑자기 의식을 잃으셨어요", True),
+    ("친구가 숨을 못 쉬어요", "친구가 숨을 못 쉬고 있어요", True),
+    ("어머니가 농약을 마셨어요", "엄마가 농약을 마셨어요", True),
+]
+
+
+def cosine(a: str, b: str) -> float | None:
+    va, vb = embed_text(normalize_text(a)), embed_text(normalize_text(b))
+    if va is None or vb is None:
+        return None
+    return float(va @ vb)
+
+
+# 캐시 lookup과 같은 규칙 검사 (A의 규칙 결과 = 캐시된 결과로 가정)
+def rules_agree_pair(a: str, b: str) -> bool:
+    info_a, _ = rule_triage(a)
+    info_b, _ = rule_triage(b)
+    return (
+        info_a["suspected_condition"] == info_b["suspected_condition"]
+        and info_a["severity"] == info_b["severity"]
+    )
+
+
+def rate(hits: list[bool]) -> float | None:
+    return round(float(np.mean(hits)), 3) if hits else None
+
+
+# 임베딩을 못 구한 쌍(score None)은 비율 계산에서 제외
+def evaluate_pairs(pairs: list[tuple[str, str, bool]]) -> dict:
+    rows = [
+        {"score": cosine(a, b), "agree": rules_agree_pair(a, b), "same": same}
+        for a, b, same in pairs
+    ]
+    scored = [r for r in rows if r["score"] is not None]
+
+    by_threshold = {}
+    for threshold in THRESHOLDS:
+        different = [r for r in scored if not r["same"]]
+        same = [r for r in scored if r["same"]]
+
+        by_threshold[threshold] = {
+            "false_hit": rate([r["score"] >= threshold for r in different]),
+            "false_hit_with_rules": rate([r["score"] >= threshold and r["agree"] for r in different]),
+            "true_hit_with_rules": rate([r["score"] >= threshold and r["agree"] for r in same]),
+        }
+
+    return {"rows": rows, "skipped": len(rows) - len(scored), "by_threshold": by_threshold}
+
+
+def main():
+    # 임베딩 모델 로드 (embed_text는 로드 전에는 None)
+    warmup_retriever()
+
+    if embed_text(normalize_text("응급")) is None:
+        raise RuntimeError("임베딩 모델이 준비되지 않았습니다. (모델 다운로드 / 벡터스토어 로드 확인)")
+
+    report = evaluate_pairs(NEAR_MISS_PAIRS)
+
+    print("=== pairs ===")
+    for (a, b, same), row in zip(NEAR_MISS_PAIRS, report["rows"]):
+        score = "  n/a" if row["score"] is None else f"{row['score']:.3f}"
+        print(f"{score}  same={same!s:<5} rules_agree={row['agree']!s:<5} {a} / {b}")
+
+    if report["skipped"]:
+        print(f"(임베딩 실패로 제외된 쌍: {report['skipped']})")
+
+    print(f"\n=== by threshold (current PARSE_CACHE_SIMILARITY={PARSE_CACHE_SIMILARITY}) ===")
+    for threshold, row in report["by_threshold"].items():
+        print(
+            f"threshold={threshold:.2f}  false_hit={row['false_hit']}  "
+            f"false_hit_with_rules={row['false_hit_with_rules']}  "
+            f"true_hit_with_rules={row['true_hit_with_rules']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
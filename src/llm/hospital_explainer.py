@@ -3,7 +3,7 @@ import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from config import LLM_API_KEY
 
 # 환경 변수 로드
@@ -12,9 +12,17 @@ load_dotenv()
 if not LLM_API_KEY:
     raise RuntimeError("LLM_API_KEY not found")
 
+LLM_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
 client = OpenAI(
     api_key=LLM_API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+    base_url=LLM_BASE_URL
+)
+
+# 비동기 API 엔드포인트용 (이벤트 루프를 막지 않음)
+async_client = AsyncOpenAI(
+    api_key=LLM_API_KEY,
+    base_url=LLM_BASE_URL
 )
 
 MODEL_NAME = "models/gemma-3-4b-it"
@@ -83,21 +91,18 @@ def extract_json(text: str) -> str:
     raise ValueError("JSON 영역을 찾을 수 없습니다.")
 
 
-# 병원 랭킹 설명 함수
-def explain_hospital_ranking(
-    ranked_results: list,
-    patient_info: dict
-) -> dict:
-
-    # ranked_results: recommend_hospitals 결과
-    # patient_info: LLM emergency_parser 결과
+def empty_explanation() -> dict:
+    return {
+        "summary": "현재 조건에 맞는 병원 추천 결과가 없습니다.",
+        "hospital_explanations": []
+    }
 
 
-    if not ranked_results:
-        return {
-            "summary": "현재 조건에 맞는 병원 추천 결과가 없습니다.",
-            "hospital_explanations": []
-        }
+# LLM 입력 프롬프트 생성 (동기·비동기 공통)
+def build_ranking_prompt(
+    ranked_results: list,
+    patient_info: dict
+) -> str:
 
     # LLM 입력용 정리
     ranked_hospitals_for_prompt = []
@@ -112,7 +117,7 @@ def explain_hospital_ranking(
             }
         })
 
-    full_prompt = (
+    return (
         SYSTEM_PROMPT
         + "\n\n"
         + USER_PROMPT_TEMPLATE.format(
@@ -121,23 +126,87 @@ def explain_hospital_ranking(
         )
     )
 
+
+def parse_llm_output(raw_text: str) -> dict:
+    json_text = extract_json(raw_text.strip())
+
+    try:
+        parsed = json.loads(json_text)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"JSON 파싱 실패:\n{json_text}") from e
+
+    return parsed
+
+
+# 병원 랭킹 설명 함수
+def explain_hospital_ranking(
+    ranked_results: list,
+    patient_info: dict
+) -> dict:
+
+    # ranked_results: recommend_hospitals 결과
+    # patient_info: LLM emergency_parser 결과
+
+
+    if not ranked_results:
+        return empty_explanation()
+
     response = client.chat.completions.create(
         model=MODEL_NAME,
         messages=[
-            {"role": "user", "content": full_prompt}
+            {"role": "user", "content": build_ranking_prompt(ranked_results, patient_info)}
         ],
         temperature=0.3
     )
 
-    raw_text = response.choices[0].message.content.strip()
-    json_text = extract_json(raw_text)
+    return parse_llm_output(response.choices[0].message.content)
 
-    try:
-        parsed = json.loads(json_text)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"JSON 파싱 실패:\n{json_text}") from e
 
-    return parsed
+async def explain_hospital_ranking_async(
+    ranked_results: list,
+    patient_info: dict
+) -> dict:
+
+    if not ranked_results:
+        return empty_explanation()
+
+    response = await async_client.chat.completions.create(
+        model=MODEL_NAME,
+        messages=[
+            {"role": "user", "content": build_ranking_prompt(ranked_results, patient_info)}
+        ],
+        temperature=0.3
+    )
+
+    return parse_llm_output(response.choices[0].message.content)
+
+
+# 스트리밍: 생성되는 대로 텍스트 조각을 yield (전체 텍스트는 parse_llm_output으로 파싱)
+async def explain_hospital_ranking_stream(
+    ranked_results: list,
+    patient_info: dict
+):
+
+    if not ranked_results:
+        return
+
+    stream = await async_client.chat.completions.create(
+        model=MODEL_NAME,
+        messages=[
+            {"role": "user", "content": build_ranking_prompt(ranked_results, patient_info)}
+        ],
+        temperature=0.3,
+        stream=True
+    )
+
+    # 중간에 멈춰도 (타임아웃 / 클라이언트 연결 끊김) 업스트림 응답을 바로 닫음
+    async with stream:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
 
 
 # 단독 실행 테스트
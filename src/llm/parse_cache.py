@@ -0,0 +1,162 @@
+import asyncio
+import copy
+import re
+import threading
+
+import numpy as np
+from cachetools import TTLCache
+
+from config import (
+    PARSE_CACHE_SEMANTIC,
+    PARSE_CACHE_SIMILARITY,
+    PARSE_CACHE_SIZE,
+    PARSE_CACHE_TTL_SEC,
+)
+from src.ml.triage import rule_triage, triage_emergency_text, triage_emergency_text_async
+from src.rag.retriever import get_embeddings, is_retriever_ready
+
+
+# 공백 / 끝 문장부호 / 대소문자 차이는 같은 문장으로 취급
+def normalize_text(text: str) -> str:
+    text = re.sub(r"\s+", " ", text or "").strip().lower()
+    return text.rstrip(".!?~… ")
+
+
+# RAG와 같은 MiniLM 임베딩 (모델 로드가 끝나기 전에는 None → 정확히 일치하는 문장만 사용)
+def embed_text(text: str) -> np.ndarray | None:
+    if not is_retriever_ready():
+        return None
+
+    vector = np.asarray(get_embeddings().embed_query(text), dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else None
+
+
+# 유사 문장 적중은 키워드 규칙으로 본 입력 문장의 질환 / 중증도가 캐시된 결과와 같을 때만 인정
+# (임베딩이 비슷해도 의미가 다른 문장에 다른 환자의 결과를 돌려주지 않도록)
+def rules_agree(text: str, patient_info: dict) -> bool:
+    rule_info, _ = rule_triage(text)
+    return (
+        rule_info["suspected_condition"] == str(patient_info.get("suspected_condition", "")).upper()
+        and rule_info["severity"] == str(patient_info.get("severity", "")).upper()
+    )
+
+
+# 정규화한 문장 → (patient_info, 임베딩) LRU + TTL 캐시
+# 1. 정규화한 문장이 같으면 바로 반환
+# 2. semantic이 켜져 있으면 저장된 문장 중 cosine 유사도가 가장 높은 것이
+#    similarity 이상이고 rules_agree를 통과할 때만 반환
+#    (기본은 꺼짐 → 유사도 기준은 python -m src.llm.eval_parse_cache로 검증 후 사용)
+class ParseCache:
+
+    def __init__(
+        self,
+        maxsize: int = PARSE_CACHE_SIZE,
+        ttl: float = PARSE_CACHE_TTL_SEC,
+        similarity: float = PARSE_CACHE_SIMILARITY,
+        semantic: bool = PARSE_CACHE_SEMANTIC
+    ):
+        self.similarity = similarity
+        self.semantic = semantic
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.semantic_rejects = 0
+        self.misses = 0
+
+    # → (캐시된 patient_info 또는 None, 입력 문장 임베딩) / 임베딩은 store에서 재사용
+    def lookup(self, text: str) -> tuple[dict | None, np.ndarray | None]:
+        key = normalize_text(text)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.exact_hits += 1
+                return copy.deepcopy(entry[0]), entry[1]
+
+            if not self.semantic:
+                self.misses += 1
+                return None, None
+
+        vector = embed_text(key)
+        if vector is None:
+            with self._lock:
+                self.misses += 1
+            return None, None
+
+        with self._lock:
+            self._entries.expire()
+            candidates = [
+                (k, entry) for k, entry in self._entries.items()
+                if entry[1] is not None
+            ]
+
+        best_key, best_entry = None, None
+        if candidates:
+            scores = np.stack([entry[1] for _, entry in candidates]) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity:
+                best_key, best_entry = candidates[best]
+
+        if best_entry is not None and not rules_agree(text, best_entry[0]):
+            with self._lock:
+                self.semantic_rejects += 1
+            best_entry = None
+
+        with self._lock:
+            if best_entry is None:
+                self.misses += 1
+                return None, vector
+
+            self._entries.get(best_key)  # LRU 순서 갱신
+            self.semantic_hits += 1
+
+        return copy.deepcopy(best_entry[0]), vector
+
+    def store(self, text: str, patient_info: dict, vector: np.ndarray | None = None):
+        with self._lock:
+            self._entries[normalize_text(text)] = (copy.deepcopy(patient_info), vector)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.exact_hits + self.semantic_hits
+            total = hits + self.misses
+            return {
+                "size": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "semantic_rejects": self.semantic_rejects,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+            }
+
+
+parse_cache = ParseCache()
+
+
+# 파싱 앞단 캐시 (동기) / 캐시에 없으면 로컬 triage → 확신도가 낮을 때만 LLM
+def parse_with_cache(text: str) -> dict:
+    patient_info, vector = parse_cache.lookup(text)
+    if patient_info is not None:
+        return patient_info
+
+    patient_info = triage_emergency_text(text)
+    parse_cache.store(text, patient_info, vector)
+    return patient_info
+
+
+# 파싱 앞단 캐시 (비동기, 임베딩 계산은 워커 스레드에서)
+async def parse_with_cache_async(text: str) -> dict:
+    patient_info, vector = await asyncio.to_thread(parse_cache.lookup, text)
+    if patient_info is not None:
+        return patient_info
+
+    patient_info = await triage_emergency_text_async(text)
+    parse_cache.store(text, patient_info, vector)
+    return patient_info
\ No newline at end of file
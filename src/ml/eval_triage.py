@@ -0,0 +1,127 @@
+# ml/eval_triage.py
+# 로컬 triage 오프라인 평가: 기록된 LLM 파싱 결과와의 일치율 / 지연 시간 비교
+# train_triage와 같은 split으로 학습한 뒤 valid 기록으로만 평가
+# 실행: python -m src.ml.eval_triage
+import time
+
+import numpy as np
+
+from src.ml.train_triage import dedupe_records, split_records
+from src.ml.triage import (
+    TARGETS,
+    TRIAGE_LOG_PATH,
+    TriageModel,
+    target_value,
+    load_triage_log,
+    local_triage,
+    rule_triage,
+)
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99]
+
+# 로컬로 처리한 요청 중 LLM과 모든 항목이 일치해야 하는 최소 비율
+TARGET_AGREEMENT = 0.98
+
+
+def percentile_ms(values: list[float], q: float) -> float:
+    return round(float(np.percentile(values, q)), 2) if values else 0.0
+
+
+def field_agreement(pred: dict, expected: dict) -> dict:
+    return {t: target_value(pred, t) == target_value(expected, t) for t in TARGETS}
+
+
+def evaluate_triage(records: list[dict], model: TriageModel | None) -> dict:
+    rows = []
+
+    for r in records:
+        start = time.perf_counter()
+        if model is None:
+            pred, conf = rule_triage(r["text"])
+        else:
+            pred, conf = local_triage(r["text"], model=model)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        agree = field_agreement(pred, r["patient_info"])
+        rows.append({
+            "confidence": conf,
+            "local_ms": elapsed_ms,
+            "llm_ms": r.get("llm_latency_ms"),
+            "agree": agree,
+            "all_agree": all(agree.values()),
+        })
+
+    n = len(rows)
+    local_ms = [row["local_ms"] for row in rows]
+    llm_ms = [row["llm_ms"] for row in rows if row["llm_ms"] is not None]
+
+    # threshold별: 로컬로 처리되는 비율 / 그중 LLM과 모든 항목이 일치하는 비율
+    by_threshold = {}
+    for threshold in THRESHOLDS:
+        covered = [row for row in rows if row["confidence"] >= threshold]
+        by_threshold[threshold] = {
+            "coverage": round(len(covered) / n, 3) if n else 0.0,
+            "agreement": round(np.mean([row["all_agree"] for row in covered]), 3) if covered else None,
+        }
+
+    return {
+        "n": n,
+        "agreement": {
+            t: round(np.mean([row["agree"][t] for row in rows]), 3) if n else None
+            for t in TARGETS
+        },
+        "all_fields_agreement": round(np.mean([row["all_agree"] for row in rows]), 3) if n else None,
+        "local_latency_ms": {"p50": percentile_ms(local_ms, 50), "p95": percentile_ms(local_ms, 95)},
+        "llm_latency_ms": {"p50": percentile_ms(llm_ms, 50), "p95": percentile_ms(llm_ms, 95)},
+        "by_threshold": by_threshold,
+    }
+
+
+# TARGET_AGREEMENT를 만족하는 가장 낮은 threshold (coverage가 가장 큼), 없으면 None
+def choose_threshold(by_threshold: dict, target: float = TARGET_AGREEMENT) -> float | None:
+    for threshold in sorted(by_threshold):
+        agreement = by_threshold[threshold]["agreement"]
+        if agreement is not None and agreement >= target:
+            return threshold
+    return None
+
+
+def print_report(name: str, report: dict):
+    print(f"\n=== [{name}] n={report['n']} ===")
+    for target, acc in report["agreement"].items():
+        print(f"{target:<20} agree={acc}")
+    print(f"{'all fields':<20} agree={report['all_fields_agreement']}")
+
+    local, llm = report["local_latency_ms"], report["llm_latency_ms"]
+    print(f"latency local p50={local['p50']}ms p95={local['p95']}ms / LLM p50={llm['p50']}ms p95={llm['p95']}ms")
+
+    for threshold, row in report["by_threshold"].items():
+        print(f"threshold={threshold}  coverage={row['coverage']}  agreement={row['agreement']}")
+
+
+def main(log_path: str = TRIAGE_LOG_PATH):
+    records = dedupe_records(load_triage_log(log_path))
+    if len(records) < 2:
+        raise ValueError(f"평가할 기록이 부족합니다: {len(records)}건")
+
+    train_records, valid_records = split_records(records)
+
+    model = TriageModel.fit(
+        [r["text"] for r in train_records],
+        [r["patient_info"] for r in train_records],
+    )
+
+    print_report("rules only", evaluate_triage(valid_records, None))
+
+    report = evaluate_triage(valid_records, model)
+    print_report("rules + model", report)
+
+    threshold = choose_threshold(report["by_threshold"])
+    if threshold is None:
+        print(f"\n모든 threshold에서 agreement < {TARGET_AGREEMENT} → TRIAGE_LOCAL_ENABLED=false 권장")
+    else:
+        print(f"\n권장 TRIAGE_CONFIDENCE_THRESHOLD={threshold} (agreement >= {TARGET_AGREEMENT})")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,7 +1,28 @@
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype, is_numeric_dtype
+
+from src.ml.schema import FEATURES
+
 SEVERITY_MAP = {"LOW": 0, "MEDIUM": 1, "HIGH": 2}
 
+# 실수형 feature (나머지는 모두 정수형)
+FLOAT_FEATURES = {"llm_confidence", "distance_km", "travel_time_min"}
+
+# 모델 입력은 아니지만 응답/설명에 필요한 병원별 값
+META_COLUMNS = [
+    "hospital_id",
+    "hospital_name",
+    "hospital_phone",
+    "total_er_beds",
+    "total_icu_beds",
+    "total_beds",
+    "er_bed_ratio",
+    "icu_bed_ratio",
+]
+
 
 def to_int(x, default=0):
     try:
@@ -21,6 +42,13 @@ def to_float(x, default=0.0):
         return default
 
 
+# Y/N 값 → 0/1 (파서가 만든 bool, 문자열 "Y" 둘 다 허용)
+def to_yn(x) -> int:
+    if isinstance(x, (bool, np.bool_)):
+        return int(x)
+    return 1 if x == "Y" else 0
+
+
 def safe_ratio(num, denom, default=0.0):
     try:
         num = float(num)
@@ -32,12 +60,8 @@ def safe_ratio(num, denom, default=0.0):
         return default
 
 
-def build_ml_features(hospital_row, patient_info: dict) -> dict:
-    now = datetime.now()
-    hour = now.hour
-    is_night = 1 if (hour >= 22 or hour <= 6) else 0
-    is_weekend = 1 if now.weekday() >= 5 else 0
-
+# 환자 feature (요청당 1번 계산)
+def build_patient_features(patient_info: dict) -> dict:
     # Severity 변환
     sev = patient_info.get("severity")
     if isinstance(sev, str):
@@ -45,6 +69,35 @@ def build_ml_features(hospital_row, patient_info: dict) -> dict:
     else:
         severity_val = to_int(sev, default=1)
 
+    resources = patient_info.get("required_resources", {})
+
+    return {
+        "severity": severity_val,
+        "cond_trauma": 1 if patient_info.get("suspected_condition") == "TRAUMA" else 0,
+        "need_icu": to_int(resources.get("need_icu", 0)),
+        "need_ventilator": to_int(resources.get("need_ventilator", 0)),
+        "need_ct": to_int(resources.get("need_ct", 0)),
+        "need_mri": to_int(resources.get("need_mri", 0)),
+        "llm_confidence": to_float(patient_info.get("confidence", 0.0)),
+    }
+
+
+# 시간 feature (요청당 1번 계산)
+def build_time_features(now: datetime | None = None) -> dict:
+    now = now or datetime.now()
+    hour = now.hour
+
+    return {
+        "hour": hour,
+        "is_night": 1 if (hour >= 22 or hour <= 6) else 0,
+        "is_weekend": 1 if now.weekday() >= 5 else 0,
+    }
+
+
+def build_ml_features(hospital_row, patient_info: dict) -> dict:
+    patient = build_patient_features(patient_info)
+    time_ctx = build_time_features()
+
     # 실시간 병상 수
     er_beds = to_int(hospital_row.get("hvec", 0))
     icu_beds = to_int(hospital_row.get("hvicc", 0))
@@ -61,20 +114,14 @@ def build_ml_features(hospital_row, patient_info: dict) -> dict:
         "hospital_phone": hospital_row.get("dutytel3"),
 
         # Patient
-        "severity": severity_val,
-        "cond_trauma": 1 if patient_info.get("suspected_condition") == "TRAUMA" else 0,
-        "need_icu": to_int(patient_info.get("required_resources", {}).get("need_icu", 0)),
-        "need_ventilator": to_int(patient_info.get("required_resources", {}).get("need_ventilator", 0)),
-        "need_ct": to_int(patient_info.get("required_resources", {}).get("need_ct", 0)),
-        "need_mri": to_int(patient_info.get("required_resources", {}).get("need_mri", 0)),
-        "llm_confidence": to_float(patient_info.get("confidence", 0.0)),
+        **patient,
 
         # Hospital (Realtime)
         "er_beds": er_beds,
         "icu_beds": icu_beds,
         "trauma_icu_beds": to_int(hospital_row.get("hv9", 0)),
-        "ct_available": 1 if hospital_row.get("hvctayn") == "Y" else 0,
-        "ventilator_available": 1 if hospital_row.get("hvventiayn") == "Y" else 0,
+        "ct_available": to_yn(hospital_row.get("hvctayn")),
+        "ventilator_available": to_yn(hospital_row.get("hvventiayn")),
 
 
         # Hospital (Static - TOTAL)
@@ -95,12 +142,157 @@ def build_ml_features(hospital_row, patient_info: dict) -> dict:
         "district_level": to_int(hospital_row.get("district_level", 2)),
 
         # Time Context
-        "hour": hour,
-        "is_night": is_night,
-        "is_weekend": is_weekend,
+        **time_ctx,
 
         # Filtering
         "filter_level": to_int(hospital_row.get("filter_level", 3)),
     }
 
-    return features
\ No newline at end of file
+    return features
+
+
+# 컬럼 단위 to_int / to_float (컬럼이 없으면 default로 채움)
+def int_column(df: pd.DataFrame, col: str, default: int = 0) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), default, dtype=np.int64)
+
+    series = df[col]
+
+    if is_integer_dtype(series) and not series.hasnans:
+        return series.to_numpy(dtype=np.int64)
+
+    if is_float_dtype(series):
+        return series.fillna(default).to_numpy().astype(np.int64)
+
+    return series.map(lambda x: to_int(x, default)).to_numpy(dtype=np.int64)
+
+
+def float_column(df: pd.DataFrame, col: str, default: float = 0.0) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), default, dtype=np.float64)
+
+    series = df[col]
+
+    if is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64)
+
+    return series.map(lambda x: to_float(x, default)).to_numpy(dtype=np.float64)
+
+
+def yn_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+
+    series = df[col]
+
+    if is_bool_dtype(series):
+        return series.to_numpy(dtype=np.int64)
+
+    return series.map(to_yn).to_numpy(dtype=np.int64)
+
+
+def ratio_column(num: np.ndarray, denom: np.ndarray) -> np.ndarray:
+    out = np.zeros(len(num), dtype=np.float64)
+    np.divide(num, denom, out=out, where=denom > 0)
+    return out
+
+
+def text_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    return df[col].to_numpy(dtype=object)
+
+
+# 후보 병원 전체를 한 번에 feature 행렬로 변환
+# 반환: (X [후보 수, len(FEATURES)] float32, 병원별 메타 DataFrame)
+# 환자 / 시간 feature는 요청당 1번 계산해서 모든 행에 broadcast
+def build_ml_feature_matrix(
+    hospital_df: pd.DataFrame,
+    patient_info: dict,
+    now: datetime | None = None
+) -> tuple[np.ndarray, pd.DataFrame]:
+
+    n = len(hospital_df)
+    patient = build_patient_features(patient_info)
+    time_ctx = build_time_features(now)
+
+    er_beds = int_column(hospital_df, "hvec")
+    icu_beds = int_column(hospital_df, "hvicc")
+
+    total_er_beds = int_column(hospital_df, "total_hvec")
+    total_icu_beds = int_column(hospital_df, "total_hvicc")
+    total_beds = int_column(hospital_df, "total_hpbdn")
+
+    columns = {
+        **patient,
+        "er_beds": er_beds,
+        "icu_beds": icu_beds,
+        "trauma_icu_beds": int_column(hospital_df, "hv9"),
+        "ct_available": yn_column(hospital_df, "hvctayn"),
+        "ventilator_available": yn_column(hospital_df, "hvventiayn"),
+        "distance_km": float_column(hospital_df, "distance_km"),
+        "travel_time_min": float_column(hospital_df, "estimated_travel_time_min"),
+        "same_district": int_column(hospital_df, "same_district", 0),
+        "district_level": int_column(hospital_df, "district_level", 2),
+        **time_ctx,
+        "filter_level": int_column(hospital_df, "filter_level", 3),
+    }
+
+    X = np.empty((n, len(FEATURES)), dtype=np.float32)
+    for j, name in enumerate(FEATURES):
+        X[:, j] = columns[name]
+
+    meta = pd.DataFrame({
+        "hospital_id": text_column(hospital_df, "hpid"),
+        "hospital_name": text_column(hospital_df, "dutyname"),
+        "hospital_phone": text_column(hospital_df, "dutytel3"),
+        "total_er_beds": total_er_beds,
+        "total_icu_beds": total_icu_beds,
+        "total_beds": total_beds,
+        "er_bed_ratio": ratio_column(er_beds, total_er_beds),
+        "icu_bed_ratio": ratio_column(icu_beds, total_icu_beds),
+    })
+
+    return X, meta
+
+
+# 행렬의 일부 행을 build_ml_features와 같은 형태의 payload로 변환 (설명 / 응답용)
+def matrix_to_payloads(
+    X: np.ndarray,
+    meta: pd.DataFrame,
+    rows=None
+) -> list[dict]:
+
+    if rows is None:
+        rows = range(len(X))
+
+    payloads = []
+
+    for i in rows:
+        m = meta.iloc[i].to_dict()
+
+        features = {
+            "hospital_name": m["hospital_name"],
+            "hospital_id": m["hospital_id"],
+            "hospital_phone": m["hospital_phone"],
+        }
+
+        for j, name in enumerate(FEATURES):
+            value = X[i, j]
+            # float32 오차 제거 (원래 값은 소수 2자리 수준)
+            features[name] = round(float(value), 4) if name in FLOAT_FEATURES else int(value)
+
+        for name in META_COLUMNS[3:]:
+            value = m[name]
+            features[name] = float(value) if name.endswith("_ratio") else int(value)
+
+        payloads.append({
+            "meta": {
+                "hospital_id": m["hospital_id"],
+                "hospital_name": m["hospital_name"],
+                "hospital_phone": m["hospital_phone"],
+            },
+            "features": features,
+        })
+
+    return payloads
\ No newline at end of file
@@ -1,11 +1,113 @@
 # src/ml/recommend.py
+import os
+import threading
+
 import joblib
+import numpy as np
 import pandas as pd
 from typing import List, Dict
 
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
 from src.ml.schema import FEATURES, payload_to_df
 
-MODEL_PATH = "models/accept_model.joblib"
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+MODEL_PATH = os.path.join(PROJECT_ROOT, "models", "accept_model.joblib")
+
+
+# StandardScaler + LogisticRegression을 가중치 1개 벡터로 합친 선형 점수기
+# sigmoid(((x - mean) / scale) · coef + b) == sigmoid(x · w + b')
+class LinearScorer:
+
+    def __init__(self, weights: np.ndarray, bias: float):
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def from_pipeline(cls, model) -> "LinearScorer | None":
+        if not isinstance(model, Pipeline) or len(model.steps) != 2:
+            return None
+
+        scaler = model.steps[0][1]
+        clf = model.steps[1][1]
+
+        if not isinstance(scaler, StandardScaler) or not isinstance(clf, LogisticRegression):
+            return None
+        if clf.coef_.shape[0] != 1:
+            return None
+
+        coef = clf.coef_[0].astype(np.float64)
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros_like(coef)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones_like(coef)
+
+        weights = coef / scale
+        bias = float(clf.intercept_[0] - np.dot(weights, mean))
+
+        return cls(weights, bias)
+
+    # X: [후보 수, len(FEATURES)] → 수용 확률
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        z = np.asarray(X, dtype=np.float64) @ self.weights + self.bias
+        return 1.0 / (1.0 + np.exp(-z))
+
+
+_model = None
+_scorer = None
+_model_lock = threading.Lock()
+
+
+# 모델은 프로세스당 1번만 로드 (서버 시작 시 미리 호출)
+def load_model():
+    global _model, _scorer
+
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is None:
+            model = joblib.load(MODEL_PATH)
+            _scorer = LinearScorer.from_pipeline(model)
+            _model = model
+
+    return _model
+
+
+# 후보 feature 행렬 점수 계산 (선형 모델이면 fast path, 아니면 predict_proba)
+def score_matrix(X: np.ndarray, fast: bool = True) -> np.ndarray:
+    model = load_model()
+
+    if fast and _scorer is not None:
+        return _scorer.predict_proba(X)
+
+    return model.predict_proba(pd.DataFrame(X, columns=FEATURES))[:, 1]
+
+
+# 확률 → threshold 컷 → Top-K (metas와 probs는 같은 순서)
+def rank_candidates(
+    metas: pd.DataFrame,
+    probs: np.ndarray,
+    *,
+    threshold: float,
+    top_k: int
+) -> list[dict]:
+
+    result_df = metas.copy()
+    result_df["accept_prob"] = probs
+
+    # soft threshold (너무 낮은 확률 제거)
+    result_df = result_df[result_df["accept_prob"] >= threshold]
+
+    if result_df.empty:
+        return []
+
+    # Top-K 랭킹
+    result_df = result_df.sort_values(
+        "accept_prob", ascending=False
+    ).head(top_k)
+
+    return result_df.to_dict(orient="records")
 
 
 def recommend_hospitals(
@@ -14,15 +116,13 @@ def recommend_hospitals(
     threshold: float = 0.3,
     top_k: int = 5,
     max_filter_level: int = 1,
+    fast: bool = True,
 ):
 
-    # 모델 로드 (학습된 모델)
-    model = joblib.load(MODEL_PATH)
-
     rows = []
     metas = []
 
-    # payload → DataFrame 변환
+    # payload → feature 행렬
     for item in hospital_payloads:
         features = item["features"]
         meta = item["meta"]
@@ -31,8 +131,13 @@ def recommend_hospitals(
         if features.get("filter_level", 99) > max_filter_level:
             continue
 
-        df_row = payload_to_df(features)
-        rows.append(df_row)
+        if fast:
+            missing = [k for k in FEATURES if k not in features]
+            if missing:
+                raise KeyError(f"Missing keys in payload: {missing}")
+            rows.append([features[k] for k in FEATURES])
+        else:
+            rows.append(payload_to_df(features))
 
         metas.append({
             **meta,
@@ -43,29 +148,46 @@ def recommend_hospitals(
     if not rows:
         return []
 
-    X = pd.concat(rows, ignore_index=True)
-
     # ML 확률 예측
-    probs = model.predict_proba(X)[:, 1]
-
-    # 결과 합치기
-    result_df = pd.DataFrame(metas)
-    result_df["accept_prob"] = probs
+    if fast:
+        probs = score_matrix(np.asarray(rows, dtype=np.float64))
+    else:
+        X = pd.concat(rows, ignore_index=True)
+        probs = load_model().predict_proba(X)[:, 1]
+
+    return rank_candidates(
+        pd.DataFrame(metas), probs, threshold=threshold, top_k=top_k
+    )
+
+
+# build_ml_feature_matrix 결과(X, meta)를 바로 점수화
+# 반환 레코드의 "row"는 X / meta의 행 번호
+def recommend_from_matrix(
+    X: np.ndarray,
+    meta: pd.DataFrame,
+    *,
+    threshold: float = 0.3,
+    top_k: int = 5,
+    max_filter_level: int = 1,
+    fast: bool = True,
+) -> list[dict]:
 
-    # soft threshold (너무 낮은 확률 제거)
-    result_df = result_df[result_df["accept_prob"] >= threshold]
+    # filter_level 컷 (1차 규칙 필터)
+    filter_level = X[:, FEATURES.index("filter_level")]
+    rows = np.flatnonzero(filter_level <= max_filter_level)
 
-    if result_df.empty:
+    if len(rows) == 0:
         return []
 
-    # Top-K 랭킹
-    result_df = result_df.sort_values(
-        "accept_prob", ascending=False
-    ).head(top_k)
-
-    print("\n[DEBUG] Ranked result_df:")
-    print(result_df)
+    probs = score_matrix(X[rows], fast=fast)
 
-    return result_df.to_dict(orient="records")
+    metas = pd.DataFrame({
+        "row": rows,
+        "hospital_id": meta["hospital_id"].to_numpy()[rows],
+        "hospital_name": meta["hospital_name"].to_numpy()[rows],
+        "hospital_phone": meta["hospital_phone"].to_numpy()[rows],
+        "distance_km": X[rows, FEATURES.index("distance_km")].astype(float).round(4),
+        "travel_time_min": X[rows, FEATURES.index("travel_time_min")].astype(float).round(4),
+    })
 
-    
\ No newline at end of file
+    return rank_candidates(metas, probs, threshold=threshold, top_k=top_k)
\ No newline at end of file
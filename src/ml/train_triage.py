@@ -0,0 +1,107 @@
+# ml/train_triage.py
+# LLM 파싱 기록(data/triage_log.jsonl)으로 로컬 triage 모델 학습
+import os
+import json
+import joblib
+
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score
+
+from src.ml.triage import (
+    TARGETS,
+    TRIAGE_LOG_PATH,
+    TRIAGE_MODEL_PATH,
+    TriageModel,
+    target_value,
+    load_triage_log,
+)
+
+META_PATH = "models/triage_model_meta.json"
+
+# 이보다 기록이 적으면 학습하지 않음
+MIN_RECORDS = 20
+
+
+# 같은 문장이 여러 번 기록되었으면 마지막 결과만 사용
+def dedupe_records(records: list[dict]) -> list[dict]:
+    latest = {}
+    for r in records:
+        latest[" ".join(r["text"].split())] = r
+    return list(latest.values())
+
+
+def split_records(records: list[dict], test_size: float = 0.2) -> tuple[list[dict], list[dict]]:
+    return train_test_split(records, test_size=test_size, random_state=42)
+
+
+def field_accuracy(model: TriageModel, records: list[dict]) -> dict:
+    preds = [model.predict_fields(r["text"])[0] for r in records]
+    return {
+        target: float(accuracy_score(
+            [target_value(r["patient_info"], target) for r in records],
+            [p[target] for p in preds],
+        ))
+        for target in TARGETS
+    }
+
+
+def main(log_path: str = TRIAGE_LOG_PATH):
+    # 데이터 로드
+    records = dedupe_records(load_triage_log(log_path))
+    if len(records) < MIN_RECORDS:
+        raise ValueError(f"학습 데이터가 부족합니다: {len(records)}건 (최소 {MIN_RECORDS}건)")
+
+    # train/valid split
+    train_records, valid_records = split_records(records)
+
+    # 학습
+    model = TriageModel.fit(
+        [r["text"] for r in train_records],
+        [r["patient_info"] for r in train_records],
+    )
+
+    # 검증
+    metrics = field_accuracy(model, valid_records)
+
+    print("\n=== [VALID] Accuracy by field ===")
+    for target, acc in metrics.items():
+        print(f"{target:<20} ACC={acc:.3f}")
+
+    # 배포용 모델은 전체 데이터로 다시 학습
+    model = TriageModel.fit(
+        [r["text"] for r in records],
+        [r["patient_info"] for r in records],
+    )
+
+    # 모델 저장
+    os.makedirs(os.path.dirname(TRIAGE_MODEL_PATH), exist_ok=True)
+    joblib.dump(model, TRIAGE_MODEL_PATH)
+    print(f"\n[OK] saved model: {TRIAGE_MODEL_PATH}")
+
+    # 메타 저장(재현/디버깅용)
+    meta = {
+        "log_path": log_path,
+        "model_path": TRIAGE_MODEL_PATH,
+        "targets": TARGETS,
+        "n_rows": len(records),
+        "train_rows": len(train_records),
+        "valid_rows": len(valid_records),
+        "train_config": {
+            "vectorizer": "TfidfVectorizer(char_wb, 1-3)",
+            "model": "LogisticRegression",
+            "max_iter": 2000,
+            "class_weight": "balanced",
+            "random_state": 42,
+            "test_size": 0.2,
+        },
+        "valid_accuracy": metrics,
+    }
+
+    os.makedirs(os.path.dirname(META_PATH), exist_ok=True)
+    with open(META_PATH, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    print(f"[OK] saved meta: {META_PATH}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
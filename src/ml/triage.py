@@ -0,0 +1,357 @@
+# 로컬 triage 분류기: 키워드 규칙 + 기록된 LLM 파싱 결과로 학습한 TF-IDF(문자 n-gram) 모델
+# 확신도가 threshold 이상이면 LLM 호출 없이 바로 patient_info 반환, 아니면 LLM으로 넘김
+import asyncio
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+
+from config import (
+    TRIAGE_CONFIDENCE_THRESHOLD,
+    TRIAGE_LOCAL_ENABLED,
+    TRIAGE_LOG_ENABLED,
+    TRIAGE_LOG_MAX_RECORDS,
+    TRIAGE_LOG_RETENTION_DAYS,
+)
+from src.llm.emergency_parser import parse_emergency_text, parse_emergency_text_async
+from src.utils.append_log import append_records, read_records, rewrite_records
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+TRIAGE_MODEL_PATH = os.path.join(PROJECT_ROOT, "models", "triage_model.joblib")
+# LLM으로 넘긴 요청의 (문장, 파싱 결과) 기록 → 학습 / 평가 데이터
+# 응급 상황 원문이 들어가므로 TRIAGE_LOG_ENABLED일 때만 기록 (git에는 올리지 않음)
+TRIAGE_LOG_PATH = os.path.join(PROJECT_ROOT, "data", "triage_log.jsonl")
+
+# 기록 중 보존 기간 / 최대 개수 정리 주기
+TRIAGE_LOG_PRUNE_INTERVAL_SEC = 3600
+
+CONDITIONS = ["CARDIAC", "RESPIRATORY", "NEURO", "TRAUMA", "BURN", "POISON", "PEDIATRIC", "UNKNOWN"]
+SEVERITIES = ["LOW", "MEDIUM", "HIGH"]
+RESOURCE_KEYS = ["need_icu", "need_ventilator", "need_ct", "need_mri"]
+
+# 모델이 예측하는 항목 (required_resources는 항목별 이진 분류)
+TARGETS = ["suspected_condition", "severity"] + RESOURCE_KEYS
+
+
+# 키워드 규칙
+
+CONDITION_KEYWORDS = {
+    "CARDIAC": ["흉통", "가슴 통증", "가슴이 아", "가슴을 움켜", "가슴이 조", "심장", "심정지", "심근경색"],
+    "RESPIRATORY": ["숨을 못", "숨이 차", "숨쉬기", "호흡곤란", "호흡이 힘", "천식", "질식", "목에 걸"],
+    "NEURO": ["마비", "말이 어눌", "발음이 어눌", "경련", "발작", "뇌졸중", "한쪽 팔", "한쪽 얼굴", "두통이 심"],
+    "TRAUMA": ["칼", "찔", "교통사고", "추락", "떨어졌", "골절", "출혈", "피가", "부딪", "치였"],
+    "BURN": ["화상", "불에", "끓는 물", "데었", "뜨거운 물", "화재"],
+    "POISON": ["중독", "농약", "삼켰", "약을 많이", "과다복용", "가스를 마", "독극물"],
+    "PEDIATRIC": ["아기", "아이가", "영아", "유아", "어린이", "소아", "개월 된", "신생아"],
+}
+
+HIGH_SEVERITY_KEYWORDS = ["의식이 없", "의식을 잃", "숨을 안", "호흡이 없", "심정지", "쓰러", "피를 많이", "대량 출혈", "맥박이 없"]
+LOW_SEVERITY_KEYWORDS = ["살짝", "가볍게", "조금", "약간"]
+
+# 질환별 기본 필요 자원 (HIGH일 때만 켜지는 자원은 별도)
+CONDITION_RESOURCES = {
+    "CARDIAC": {"need_icu": True, "need_ct": True},
+    "RESPIRATORY": {"need_ventilator": True},
+    "NEURO": {"need_ct": True, "need_mri": True},
+    "TRAUMA": {"need_ct": True},
+    "BURN": {},
+    "POISON": {},
+    "PEDIATRIC": {},
+    "UNKNOWN": {},
+}
+HIGH_SEVERITY_RESOURCES = {"need_icu": True}
+
+# 규칙만으로 낼 수 있는 최대 확신도 (기본 threshold보다 낮게 → 규칙 단독으로는 LLM을 건너뛰지 않음)
+RULE_MAX_CONFIDENCE = 0.75
+
+
+def make_patient_info(
+    condition: str,
+    severity: str,
+    resources: dict,
+    confidence: float,
+    notes: str = ""
+) -> dict:
+    return {
+        "severity": severity,
+        "suspected_condition": condition,
+        "required_resources": {k: bool(resources.get(k, False)) for k in RESOURCE_KEYS},
+        "notes": notes,
+        "confidence": round(float(confidence), 3),
+    }
+
+
+def _keyword_hits(text: str, keywords: list[str]) -> int:
+    return sum(1 for k in keywords if k in text)
+
+
+# 키워드 규칙 → (patient_info, 확신도)
+def rule_triage(text: str) -> tuple[dict, float]:
+    text = " ".join((text or "").split())
+
+    hits = {
+        condition: _keyword_hits(text, keywords)
+        for condition, keywords in CONDITION_KEYWORDS.items()
+    }
+    matched = [c for c, n in hits.items() if n > 0]
+
+    # 소아는 다른 질환과 같이 나오면 다른 질환 우선
+    if len(matched) > 1 and "PEDIATRIC" in matched:
+        matched.remove("PEDIATRIC")
+
+    if len(matched) == 1:
+        condition = matched[0]
+        confidence = min(RULE_MAX_CONFIDENCE, 0.5 + 0.1 * hits[condition])
+    elif matched:
+        condition = max(matched, key=lambda c: hits[c])
+        confidence = 0.3
+    else:
+        condition = "UNKNOWN"
+        confidence = 0.2
+
+    if _keyword_hits(text, HIGH_SEVERITY_KEYWORDS):
+        severity = "HIGH"
+    elif _keyword_hits(text, LOW_SEVERITY_KEYWORDS):
+        severity = "LOW"
+    else:
+        severity = "MEDIUM"
+
+    resources = dict(CONDITION_RESOURCES[condition])
+    if severity == "HIGH":
+        resources.update(HIGH_SEVERITY_RESOURCES)
+
+    return make_patient_info(condition, severity, resources, confidence, notes="rule"), confidence
+
+
+# 학습 모델
+
+def target_value(patient_info: dict, target: str):
+    if target in RESOURCE_KEYS:
+        return bool((patient_info.get("required_resources") or {}).get(target, False))
+
+    value = str(patient_info.get(target, "")).upper()
+    allowed = CONDITIONS if target == "suspected_condition" else SEVERITIES
+    return value if value in allowed else ("UNKNOWN" if target == "suspected_condition" else "MEDIUM")
+
+
+# 항목별 TF-IDF(문자 n-gram) + LogisticRegression
+# 학습 데이터에 값이 하나뿐인 항목은 상수로 저장
+class TriageModel:
+
+    def __init__(self, models: dict, constants: dict):
+        self.models = models
+        self.constants = constants
+
+    @classmethod
+    def fit(cls, texts: list[str], patient_infos: list[dict]) -> "TriageModel":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+
+        models, constants = {}, {}
+
+        for target in TARGETS:
+            y = [target_value(p, target) for p in patient_infos]
+
+            if len(set(y)) < 2:
+                constants[target] = y[0] if y else None
+                continue
+
+            model = Pipeline(
+                steps=[
+                    ("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(1, 3), sublinear_tf=True)),
+                    ("clf", LogisticRegression(max_iter=2000, class_weight="balanced")),
+                ]
+            )
+            model.fit(texts, y)
+            models[target] = model
+
+        return cls(models, constants)
+
+    # 문장 1개 → (항목별 예측값, 항목별 확률)
+    def predict_fields(self, text: str) -> tuple[dict, dict]:
+        values, probs = {}, {}
+
+        for target in TARGETS:
+            model = self.models.get(target)
+            if model is None:
+                values[target] = self.constants.get(target)
+                probs[target] = 1.0
+                continue
+
+            proba = model.predict_proba([text])[0]
+            best = int(np.argmax(proba))
+            values[target] = model.classes_[best]
+            probs[target] = float(proba[best])
+
+        return values, probs
+
+    # → (patient_info, 확신도) / 확신도는 필요 자원까지 포함한 모든 항목 확률 중 가장 낮은 값
+    def predict(self, text: str) -> tuple[dict, float]:
+        values, probs = self.predict_fields(text)
+        confidence = min(probs[t] for t in TARGETS)
+
+        resources = {k: bool(values[k]) for k in RESOURCE_KEYS}
+        patient_info = make_patient_info(
+            values["suspected_condition"] or "UNKNOWN",
+            values["severity"] or "MEDIUM",
+            resources,
+            confidence,
+            notes="local",
+        )
+        return patient_info, confidence
+
+
+_model = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+# 학습된 모델이 없으면 None (규칙만 사용)
+def load_triage_model() -> TriageModel | None:
+    global _model, _model_loaded
+
+    if _model_loaded:
+        return _model
+
+    with _model_lock:
+        if not _model_loaded:
+            if os.path.exists(TRIAGE_MODEL_PATH):
+                try:
+                    _model = joblib.load(TRIAGE_MODEL_PATH)
+                except Exception as e:
+                    print(f"[WARN] Failed to load triage model: {e}")
+            _model_loaded = True
+
+    return _model
+
+
+# 규칙 + 모델 → (patient_info, 확신도)
+# 규칙과 모델은 같은 문장을 보므로 확신도를 합치지 않음:
+# 질환이 같으면 모델 확신도 그대로, 다르면 낮춰서 LLM으로 넘어가게 함
+def local_triage(text: str, model: TriageModel | None = None) -> tuple[dict, float]:
+    rule_info, rule_conf = rule_triage(text)
+    model = model if model is not None else load_triage_model()
+
+    if model is None:
+        return rule_info, rule_conf
+
+    info, conf = model.predict(text)
+
+    if (
+        rule_info["suspected_condition"] != "UNKNOWN"
+        and rule_info["suspected_condition"] != info["suspected_condition"]
+    ):
+        conf = min(conf, 0.5)
+
+    info["confidence"] = round(conf, 3)
+    return info, conf
+
+
+# 기록
+
+_last_prune_at = 0.0
+_prune_lock = threading.Lock()
+
+
+def _retention_cutoff() -> float:
+    return time.time() - TRIAGE_LOG_RETENTION_DAYS * 86400
+
+
+# 보존 기간이 지난 기록 삭제 + 최근 max_records개만 유지 → 남은 기록 수
+def prune_triage_log(
+    path: str | None = None,
+    max_records: int = TRIAGE_LOG_MAX_RECORDS
+) -> int:
+    path = path or TRIAGE_LOG_PATH
+    cutoff = _retention_cutoff()
+
+    def keep(records: list[dict]) -> list[dict]:
+        records = [r for r in records if r.get("logged_at", 0) >= cutoff]
+        return records[-max_records:] if max_records > 0 else records
+
+    return rewrite_records(path, keep)
+
+
+def _prune_if_due():
+    global _last_prune_at
+
+    now = time.monotonic()
+    with _prune_lock:
+        if _last_prune_at and now - _last_prune_at < TRIAGE_LOG_PRUNE_INTERVAL_SEC:
+            return
+        _last_prune_at = now
+
+    prune_triage_log()
+
+
+def log_llm_parse(text: str, patient_info: dict, latency_ms: float):
+    if not TRIAGE_LOG_ENABLED:
+        return
+
+    try:
+        append_records(TRIAGE_LOG_PATH, [{
+            "text": text,
+            "patient_info": patient_info,
+            "llm_latency_ms": round(latency_ms, 1),
+            "logged_at": time.time(),
+        }])
+        _prune_if_due()
+    except Exception as e:
+        print(f"[WARN] Failed to write triage log: {e}")
+
+
+# 보존 기간이 지난 기록은 정리 전이라도 학습 / 평가에 쓰지 않음
+def load_triage_log(path: str = TRIAGE_LOG_PATH) -> list[dict]:
+    records, _ = read_records(path)
+    cutoff = _retention_cutoff()
+    return [
+        r for r in records
+        if isinstance(r.get("text"), str)
+        and isinstance(r.get("patient_info"), dict)
+        and r.get("logged_at", 0) >= cutoff
+    ]
+
+
+# 메인 함수: 로컬 확신도가 threshold 이상이면 로컬 결과, 아니면 LLM 파싱 (TRIAGE_LOG_ENABLED면 학습용으로 기록)
+
+def triage_emergency_text(text: str, threshold: float = TRIAGE_CONFIDENCE_THRESHOLD) -> dict:
+    if TRIAGE_LOCAL_ENABLED:
+        patient_info, confidence = local_triage(text)
+        if confidence >= threshold:
+            return patient_info
+
+    start = time.perf_counter()
+    patient_info = parse_emergency_text(text)
+    log_llm_parse(text, patient_info, (time.perf_counter() - start) * 1000)
+    return patient_info
+
+
+# 모델 로드(joblib) / 예측과 기록(정리 시 파일 전체 재작성)은 워커 스레드에서
+async def triage_emergency_text_async(text: str, threshold: float = TRIAGE_CONFIDENCE_THRESHOLD) -> dict:
+    if TRIAGE_LOCAL_ENABLED:
+        patient_info, confidence = await asyncio.to_thread(local_triage, text)
+        if confidence >= threshold:
+            return patient_info
+
+    start = time.perf_counter()
+    patient_info = await parse_emergency_text_async(text)
+
+    if TRIAGE_LOG_ENABLED:
+        await asyncio.to_thread(
+            log_llm_parse, text, patient_info, (time.perf_counter() - start) * 1000
+        )
+    return patient_info
+
+
+if __name__ == "__main__":
+    for sample in [
+        "어떤 남자가 흉부에 칼을 찔려서 쓰러져있습니다.",
+        "아버지가 갑자기 가슴을 움켜쥐고 쓰러졌어요",
+        "아이가 뜨거운 물에 데었어요",
+        "머리가 좀 아파요",
+    ]:
+        info, conf = local_triage(sample)
+        print(f"{conf:.2f}  {info['suspected_condition']:<12} {info['severity']:<6} {sample}")
\ No newline at end of file
@@ -1,52 +1,176 @@
-import requests
+import io
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 import xml.etree.ElementTree as ET
-from config import SERVICE_KEY, API_URL
+from config import SERVICE_KEY, API_URL, PUBLIC_API_HEDGE_SEC, PAGE_FETCH_CONCURRENCY
+from src.utils.http_client import http_get
 
 
 
-# 공공 응급의료 API 호출 후 DataFrame 반환
+# 병상 수 태그 → int64 컬럼 (값이 없거나 숫자가 아니면 0)
+INT_TAGS = {
+    "hvec", "hvoc", "hvcc", "hvncc", "hvccc", "hvicc", "hvgc",
+    "hv2", "hv3", "hv4", "hv5", "hv6", "hv7", "hv8", "hv9",
+}
 
-def fetch_emergency_data(
-    stage1: str,
-    stage2: str,
+# Y/N 태그 → bool 컬럼 ("Y"만 True, 태그 이름이 ...ayn으로 끝나는 것 포함)
+BOOL_TAGS = {"hvamyn", "hv10", "hv11"}
+
+
+def tag_type(tag: str) -> str:
+    if tag in INT_TAGS:
+        return "int"
+    if tag in BOOL_TAGS or tag.endswith("ayn"):
+        return "bool"
+    return "str"
+
+
+def _parse_int(text) -> int:
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return 0
+
+
+# 응답 XML을 iterparse로 한 번 훑으면서 item 값을 컬럼별로 모아 타입 배열로 변환
+# (전체 트리 / 행 dict를 만들지 않음, 처리한 item은 바로 해제) → (DataFrame, totalCount)
+def parse_emergency_xml(content: bytes) -> tuple[pd.DataFrame, int]:
+    # 컬럼별 (행 번호 목록, 값 목록) → 마지막에 타입별 배열로 한 번에 채움 (없는 값은 기본값)
+    rows: dict[str, list] = {}
+    values: dict[str, list] = {}
+    tag_columns: dict[str, str] = {}
+    n_rows = 0
+    header = {}
+
+    for _, elem in ET.iterparse(io.BytesIO(content)):
+        tag = elem.tag
+
+        if tag == "item":
+            for child in elem:
+                col = tag_columns.get(child.tag)
+                if col is None:
+                    col = tag_columns[child.tag] = child.tag.lower()
+                    rows[col] = []
+                    values[col] = []
+
+                rows[col].append(n_rows)
+                values[col].append(child.text)
+
+            n_rows += 1
+            elem.clear()
+
+        elif tag in ("resultCode", "resultMsg", "totalCount"):
+            header[tag] = elem.text
+
+    # 결과 코드 확인
+    if header.get("resultCode") != "00":
+        raise RuntimeError(f"API Error {header.get('resultCode')}: {header.get('resultMsg')}")
+
+    data = {}
+    for col, col_rows in rows.items():
+        kind = tag_type(col)
+        col_values = values[col]
+
+        if kind == "int":
+            arr = np.zeros(n_rows, dtype=np.int64)
+            arr[col_rows] = [_parse_int(v) for v in col_values]
+        elif kind == "bool":
+            arr = np.zeros(n_rows, dtype=bool)
+            arr[col_rows] = [v == "Y" for v in col_values]
+        else:
+            arr = np.full(n_rows, None, dtype=object)
+            arr[col_rows] = col_values
+
+        data[col] = arr
+
+    df = pd.DataFrame(data, index=pd.RangeIndex(n_rows))
+
+    try:
+        total_count = int(header.get("totalCount") or n_rows)
+    except ValueError:
+        total_count = n_rows
+
+    return df, total_count
+
+
+# 공공 응급의료 API 1페이지 호출 후 (DataFrame, totalCount) 반환
+# stage2를 생략하면 시/도(STAGE1) 전체, stage1도 생략하면 전국을 조회
+
+def fetch_emergency_page(
+    stage1: str | None,
+    stage2: str | None = None,
     page_no: int = 1,
     num_of_rows: int = 100
-) -> pd.DataFrame:
+) -> tuple[pd.DataFrame, int]:
 
     params = {
         "serviceKey": SERVICE_KEY,
-        "STAGE1": stage1,
-        "STAGE2": stage2,
         "pageNo": page_no,
         "numOfRows": num_of_rows,
     }
 
-    response = requests.get(API_URL, params=params, timeout=10)
-    response.raise_for_status()
+    if stage1:
+        params["STAGE1"] = stage1
+    if stage2:
+        params["STAGE2"] = stage2
 
-    root = ET.fromstring(response.content)
+    response = http_get(
+        API_URL,
+        params=params,
+        hedge_after=PUBLIC_API_HEDGE_SEC or None
+    )
 
-    # 결과 코드 확인
-    result_code = root.findtext(".//resultCode")
-    result_msg = root.findtext(".//resultMsg")
+    return parse_emergency_xml(response.content)
 
-    if result_code != "00":
-        raise RuntimeError(f"API Error {result_code}: {result_msg}")
 
-    items = root.findall(".//item")
+# 공공 응급의료 API 호출 후 DataFrame 반환
+# 1페이지의 totalCount로 전체 페이지 수를 구하고, 나머지 페이지는 동시에 조회해서 페이지 순서대로 합침
 
-    rows = []
-    for item in items:
-        row = {}
-        for child in item:
-            row[child.tag] = child.text
-        rows.append(row)
+def fetch_emergency_data(
+    stage1: str | None,
+    stage2: str | None = None,
+    num_of_rows: int = 100,
+    max_pages: int | None = None
+) -> pd.DataFrame:
+
+    first_df, total_count = fetch_emergency_page(
+        stage1=stage1,
+        stage2=stage2,
+        page_no=1,
+        num_of_rows=num_of_rows
+    )
+
+    n_pages = math.ceil(total_count / num_of_rows) if num_of_rows > 0 else 1
+    if max_pages is not None:
+        n_pages = min(n_pages, max_pages)
 
-    df = pd.DataFrame(rows)
+    if first_df.empty or n_pages <= 1:
+        return first_df
 
-    if not df.empty:
-        df.columns = df.columns.astype(str).str.lower()
+    def fetch_page(page_no: int) -> pd.DataFrame:
+        df, _ = fetch_emergency_page(
+            stage1=stage1,
+            stage2=stage2,
+            page_no=page_no,
+            num_of_rows=num_of_rows
+        )
+        return df
+
+    page_numbers = range(2, n_pages + 1)
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(PAGE_FETCH_CONCURRENCY, len(page_numbers)))
+    ) as executor:
+        frames = [first_df] + list(executor.map(fetch_page, page_numbers))
+
+    frames = [df for df in frames if not df.empty]
+    df = pd.concat(frames, ignore_index=True)
+
+    # 조회 중에 데이터가 갱신되어 페이지 경계가 밀리면 같은 병원이 두 번 나올 수 있음
+    if "hpid" in df.columns:
+        df = df.drop_duplicates(subset=["hpid"], keep="first").reset_index(drop=True)
 
     return df
 
@@ -56,7 +180,6 @@ if __name__ == "__main__":
     df = fetch_emergency_data(
         stage1="서울특별시",
         stage2="강남구",
-        page_no=1,
         num_of_rows=50,
     )
 
@@ -1,8 +1,8 @@
-import requests
 import xml.etree.ElementTree as ET
-from config import SERVICE_KEY
+from config import SERVICE_KEY, STATIC_API_URL, PUBLIC_API_HEDGE_SEC
+from src.utils.http_client import http_get
 
-BASE_URL = "http://apis.data.go.kr/B552657/ErmctInfoInqireService/getEgytBassInfoInqire"
+BASE_URL = STATIC_API_URL
 
 
 def fetch_hospital_static_by_hpid(hpid: str) -> dict | None:
@@ -13,8 +13,11 @@ def fetch_hospital_static_by_hpid(hpid: str) -> dict | None:
         "numOfRows": 1,
     }
 
-    res = requests.get(BASE_URL, params=params, timeout=10)
-    res.raise_for_status()
+    res = http_get(
+        BASE_URL,
+        params=params,
+        hedge_after=PUBLIC_API_HEDGE_SEC or None
+    )
 
     root = ET.fromstring(res.content)
     item = root.find(".//item")
@@ -0,0 +1,109 @@
+# 정적 병원 정보(getEgytBassInfoInqire) 일괄 사전 조회
+# 실시간 API로 지역별 hpid 목록을 구한 뒤, 정적 정보를 동시에 조회해서 저장소에 한 번에 기록
+# 실행: python -m src.opendata.prefetch_static 서울특별시 경기도 --concurrency 8 --rate 10
+
+import argparse
+import time
+
+from config import SNAPSHOT_REGIONS, STATIC_FETCH_CONCURRENCY, STATIC_FETCH_RATE_PER_SEC
+from src.opendata.snapshot import fetch_city_emergency_data
+from src.opendata.snapshot_poller import parse_region_intervals
+from src.opendata.static_cache import STATIC_FETCH_RETRIES, fetch_static_records, static_store
+
+DEFAULT_CONCURRENCY = STATIC_FETCH_CONCURRENCY
+DEFAULT_RATE_PER_SEC = STATIC_FETCH_RATE_PER_SEC
+DEFAULT_RETRIES = STATIC_FETCH_RETRIES
+
+
+# 지역별 실시간 API 조회 결과에서 hpid 목록 수집 (순서 유지, 중복 제거)
+def collect_hpids(regions: list[str]) -> list[str]:
+    hpids = {}
+
+    for city in regions:
+        df = fetch_city_emergency_data(city)
+        if df.empty or "hpid" not in df.columns:
+            print(f"[WARN] No hospitals found for {city}")
+            continue
+
+        for hpid in df["hpid"].dropna():
+            hpids.setdefault(hpid, city)
+
+    return list(hpids)
+
+
+def prefetch_static(
+    regions: list[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_per_sec: float = DEFAULT_RATE_PER_SEC,
+    retries: int = DEFAULT_RETRIES,
+    refresh: bool = False,
+    compact: bool = False
+) -> dict:
+
+    started = time.perf_counter()
+    hpids = collect_hpids(regions)
+
+    # 이미 저장소에 있는 병원은 건너뜀 (refresh면 전부 다시 조회)
+    if refresh:
+        targets = hpids
+    else:
+        targets = [
+            hpid for hpid, info in zip(hpids, static_store.get_many(hpids))
+            if info is None
+        ]
+
+    records, missing, failed = fetch_static_records(
+        targets,
+        concurrency=concurrency,
+        rate_per_sec=rate_per_sec,
+        retries=retries,
+    )
+
+    # 저장은 한 번에
+    static_store.put_many(records)
+
+    if compact:
+        static_store.compact()
+
+    return {
+        "regions": regions,
+        "hospitals": len(hpids),
+        "fetched": len(records),
+        "cached": len(hpids) - len(targets),
+        "missing": missing,
+        "failed": failed,
+        "elapsed_sec": round(time.perf_counter() - started, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "regions",
+        nargs="*",
+        help="시/도 이름 (생략하면 SNAPSHOT_REGIONS)"
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_SEC, help="초당 최대 호출 수")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--refresh", action="store_true", help="저장된 병원도 다시 조회")
+    parser.add_argument("--compact", action="store_true", help="journal을 CSV로 합치기")
+    args = parser.parse_args()
+
+    regions = args.regions or list(parse_region_intervals(SNAPSHOT_REGIONS))
+
+    summary = prefetch_static(
+        regions,
+        concurrency=args.concurrency,
+        rate_per_sec=args.rate,
+        retries=args.retries,
+        refresh=args.refresh,
+        compact=args.compact,
+    )
+
+    print(
+        f"regions={summary['regions']} hospitals={summary['hospitals']} "
+        f"fetched={summary['fetched']} cached={summary['cached']} "
+        f"missing={len(summary['missing'])} failed={len(summary['failed'])} "
+        f"elapsed={summary['elapsed_sec']}s"
+    )
\ No newline at end of file
@@ -0,0 +1,218 @@
+import threading
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from src.hospital.distance import add_hospital_coordinates
+from src.hospital.spatial import HospitalSpatialIndex
+from src.opendata.fetch_hospital_api import fetch_emergency_data
+from src.opendata.static_cache import get_static_info_many
+
+# 스냅샷 유효 시간(초) / 페이지당 조회 건수
+SNAPSHOT_MAX_AGE_SEC = 60
+SNAPSHOT_PAGE_SIZE = 500
+
+
+# 시/도 단위 실시간 응급 데이터 스냅샷 (생성 후 변경하지 않음)
+@dataclass(frozen=True)
+class EmergencySnapshot:
+    city: str
+    df: pd.DataFrame
+    version: int
+    fetched_at: float
+    by_district: dict = field(default_factory=dict, repr=False)
+    spatial_index: HospitalSpatialIndex | None = field(default=None, repr=False)
+
+    @property
+    def age_sec(self) -> float:
+        return time.time() - self.fetched_at
+
+    # 구 단위 데이터 (구별 API 호출 결과와 같은 형태)
+    def district_frame(self, district: str) -> pd.DataFrame:
+        df = self.by_district.get(district)
+        if df is None:
+            return pd.DataFrame()
+        return df.copy()
+
+    # 반경 이내 병원 (가까운 순, district 컬럼 포함)
+    def nearby_frame(self, lat: float, lon: float, radius_km: float | None) -> pd.DataFrame:
+        if self.df.empty or self.spatial_index is None:
+            return pd.DataFrame()
+
+        if radius_km is None:
+            positions = self.spatial_index.positions
+        else:
+            positions, _ = self.spatial_index.query_radius(lat, lon, radius_km)
+
+        return self.df.iloc[positions].reset_index(drop=True)
+
+
+_snapshots: dict[str, EmergencySnapshot] = {}
+_snapshots_lock = threading.Lock()
+_city_locks: dict[str, threading.Lock] = {}
+_city_max_age: dict[str, float] = {}
+_version = 0
+
+
+def _city_lock(city: str) -> threading.Lock:
+    with _snapshots_lock:
+        return _city_locks.setdefault(city, threading.Lock())
+
+
+# 주소("서울특별시 강남구 ...")에서 시/군/구 추출
+def district_from_address(address) -> str | None:
+    if not isinstance(address, str):
+        return None
+    parts = address.split()
+    return parts[1] if len(parts) >= 2 else None
+
+
+# STAGE1만 지정해서 시/도 전체를 모든 페이지에 걸쳐 조회
+def fetch_city_emergency_data(city: str) -> pd.DataFrame:
+    return fetch_emergency_data(stage1=city, num_of_rows=SNAPSHOT_PAGE_SIZE)
+
+
+# 실시간 데이터에는 주소가 없으므로 정적 정보(dutyaddr)로 병원별 구를 채움
+# defer_static이면 저장소에 없는 병원은 구 없이 두고 백그라운드 조회만 예약
+def annotate_district(df: pd.DataFrame, defer_static: bool = False) -> pd.DataFrame:
+    df = df.copy()
+
+    df["district"] = [
+        district_from_address((static_info or {}).get("total_dutyaddr"))
+        for static_info in get_static_info_many(df["hpid"], defer_missing=defer_static)
+    ]
+    return df
+
+
+def build_city_snapshot(city: str) -> EmergencySnapshot:
+    global _version
+
+    df = fetch_city_emergency_data(city)
+
+    by_district = {}
+    spatial_index = None
+    if not df.empty:
+        # 요청 경로에서 정적 정보 API를 기다리지 않도록 저장된 정보로만 만들고
+        # 없는 병원은 백그라운드로 채워서 다음 갱신부터 반영
+        df = annotate_district(df, defer_static=True)
+        df = add_hospital_coordinates(df, defer_static=True)
+        spatial_index = HospitalSpatialIndex(df["hospital_lat"], df["hospital_lon"])
+        by_district = {
+            district: group.drop(columns=["district"]).reset_index(drop=True)
+            for district, group in df.groupby("district", sort=False)
+        }
+
+    with _snapshots_lock:
+        _version += 1
+        version = _version
+
+    return EmergencySnapshot(
+        city=city,
+        df=df,
+        version=version,
+        fetched_at=time.time(),
+        by_district=by_district,
+        spatial_index=spatial_index,
+    )
+
+
+# 새 스냅샷을 만들어 교체 (읽는 쪽은 항상 완성된 스냅샷만 봄)
+# 호출하는 쪽에서 _city_lock(city)를 잡고 있어야 함
+def _install_city_snapshot(city: str) -> EmergencySnapshot:
+    snapshot = build_city_snapshot(city)
+
+    with _snapshots_lock:
+        _snapshots[city] = snapshot
+
+    return snapshot
+
+
+# 백그라운드 갱신용: 요청 경로와 같은 시별 잠금을 잡고 갱신
+# 잠금을 기다리는 동안 min_age_sec보다 새 스냅샷이 설치됐으면 다시 만들지 않고 그대로 반환
+def refresh_city_snapshot(city: str, min_age_sec: float = 0.0) -> EmergencySnapshot:
+    with _city_lock(city):
+        snapshot = peek_city_snapshot(city)
+        if snapshot is not None and snapshot.age_sec < min_age_sec:
+            return snapshot
+
+        return _install_city_snapshot(city)
+
+
+def peek_city_snapshot(city: str) -> EmergencySnapshot | None:
+    with _snapshots_lock:
+        return _snapshots.get(city)
+
+
+# 메모리에 올라와 있는 모든 시의 스냅샷 (시 경계 근처 검색용)
+def loaded_snapshots() -> list[EmergencySnapshot]:
+    with _snapshots_lock:
+        return list(_snapshots.values())
+
+
+# 백그라운드 갱신 중인 시는 요청 경로에서 더 오래된 스냅샷도 허용
+def set_city_max_age(city: str, max_age_sec: float | None):
+    with _snapshots_lock:
+        if max_age_sec is None:
+            _city_max_age.pop(city, None)
+        else:
+            _city_max_age[city] = max_age_sec
+
+
+# 메모리에 올라와 있는 스냅샷 중 가장 최신 버전 (스냅샷이 교체될 때만 증가, 없으면 0)
+def snapshot_version() -> int:
+    with _snapshots_lock:
+        return max((snap.version for snap in _snapshots.values()), default=0)
+
+
+# 시별 스냅샷 버전 / 경과 시간
+def snapshot_status() -> dict:
+    with _snapshots_lock:
+        snapshots = dict(_snapshots)
+
+    return {
+        city: {
+            "version": snap.version,
+            "fetched_at": snap.fetched_at,
+            "age_sec": round(snap.age_sec, 1),
+            "hospitals": len(snap.df),
+        }
+        for city, snap in snapshots.items()
+    }
+
+
+# 메인 함수: 유효한 스냅샷이 있으면 메모리에서 반환, 없거나 오래됐으면 갱신
+def get_city_snapshot(
+    city: str,
+    max_age_sec: float = SNAPSHOT_MAX_AGE_SEC
+) -> EmergencySnapshot:
+
+    with _snapshots_lock:
+        max_age_sec = max(max_age_sec, _city_max_age.get(city, 0))
+
+    snapshot = peek_city_snapshot(city)
+    if snapshot is not None and snapshot.age_sec <= max_age_sec:
+        return snapshot
+
+    # 같은 시에 대한 동시 갱신은 1번만 수행
+    with _city_lock(city):
+        snapshot = peek_city_snapshot(city)
+        if snapshot is not None and snapshot.age_sec <= max_age_sec:
+            return snapshot
+
+        return _install_city_snapshot(city)
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    snap = get_city_snapshot("서울특별시")
+    elapsed = time.perf_counter() - start
+
+    print(f"version={snap.version}  rows={len(snap.df)}  build={elapsed:.2f}s")
+    for name, part in snap.by_district.items():
+        print(f"  {name}: {len(part)}")
+
+    start = time.perf_counter()
+    part = get_city_snapshot("서울특별시").district_frame("강남구")
+    elapsed = time.perf_counter() - start
+    print(f"강남구 조회: {len(part)}건  {elapsed * 1000:.3f}ms")
\ No newline at end of file
@@ -0,0 +1,85 @@
+import asyncio
+
+from config import SNAPSHOT_REGIONS, SNAPSHOT_REFRESH_SEC
+from src.opendata.snapshot import refresh_city_snapshot, set_city_max_age
+
+# 갱신이 이 배수만큼 밀리기 전까지는 요청 경로에서 API를 호출하지 않음
+STALE_FACTOR = 3
+
+# 주기의 이 비율보다 최근에 (요청 경로 등에서) 갱신된 스냅샷이면 이번 갱신은 건너뜀
+SKIP_FRESH_FACTOR = 0.5
+
+_tasks: list[asyncio.Task] = []
+_stop_event: asyncio.Event | None = None
+
+
+# "서울특별시:60,경기도:120" → {"서울특별시": 60.0, "경기도": 120.0}
+def parse_region_intervals(
+    spec: str,
+    default_interval: float = SNAPSHOT_REFRESH_SEC
+) -> dict[str, float]:
+
+    regions = {}
+
+    for token in (spec or "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+
+        city, _, interval = token.partition(":")
+        regions[city.strip()] = float(interval) if interval else default_interval
+
+    return regions
+
+
+# 한 지역을 주기적으로 갱신 (스냅샷 교체는 refresh_city_snapshot에서 원자적으로 수행)
+async def poll_region(city: str, interval_sec: float, stop_event: asyncio.Event):
+    set_city_max_age(city, interval_sec * STALE_FACTOR)
+
+    try:
+        while not stop_event.is_set():
+            try:
+                snapshot = await asyncio.to_thread(
+                    refresh_city_snapshot, city, interval_sec * SKIP_FRESH_FACTOR
+                )
+                print(
+                    f"[SNAPSHOT] {city} v{snapshot.version} "
+                    f"rows={len(snapshot.df)}"
+                )
+            except Exception as e:
+                print(f"[WARN] Snapshot refresh failed for {city}: {e}")
+
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval_sec)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        set_city_max_age(city, None)
+
+
+def start_snapshot_poller(regions: dict[str, float] | None = None) -> list[asyncio.Task]:
+    global _stop_event
+
+    if regions is None:
+        regions = parse_region_intervals(SNAPSHOT_REGIONS)
+
+    _stop_event = asyncio.Event()
+
+    for city, interval_sec in regions.items():
+        _tasks.append(
+            asyncio.create_task(
+                poll_region(city, interval_sec, _stop_event),
+                name=f"snapshot-poller:{city}"
+            )
+        )
+
+    return list(_tasks)
+
+
+async def stop_snapshot_poller():
+    if _stop_event is not None:
+        _stop_event.set()
+
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
+        _tasks.clear()
\ No newline at end of file
@@ -1,52 +1,309 @@
+import json
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from config import STATIC_FETCH_CONCURRENCY, STATIC_FETCH_RATE_PER_SEC
 from src.opendata.fetch_hospital_static_api import fetch_hospital_static_by_hpid
+from src.utils.append_log import (
+    append_records,
+    file_lock,
+    journal_generation,
+    read_journal,
+    rotate_journal,
+)
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 CSV_PATH = os.path.join(PROJECT_ROOT, "data", "hospital_static.csv")
+# 새로 조회한 정적 정보는 CSV 전체를 다시 쓰지 않고 이 파일에 한 줄씩 추가
+JOURNAL_PATH = os.path.join(PROJECT_ROOT, "data", "hospital_static.jsonl")
+
+HPID_KEY = "total_hpid"
+
+STATIC_FETCH_RETRIES = 3
+RETRY_BASE_DELAY_SEC = 0.5
+
+
+def _clean_record(record: dict) -> dict:
+    return {k: (None if pd.isna(v) else v) for k, v in record.items()}
+
+
+# CSV는 모든 값을 문자열로 읽음 (API 응답과 같은 형태)
+def _read_csv_records(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+
+    try:
+        df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    except Exception as e:
+        print(f"[WARN] Failed to load static cache CSV: {e}")
+        return []
+
+    df.columns = df.columns.str.lower()
+    return [_clean_record(r) for r in df.to_dict(orient="records")]
+
+
+# 프로세스 전역 정적 병원 정보 저장소 (1회 로드, hpid → 레코드 dict)
+class StaticStore:
+
+    def __init__(self, csv_path: str = CSV_PATH, journal_path: str = JOURNAL_PATH):
+        self.csv_path = csv_path
+        self.journal_path = journal_path
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._journal_position = None
+
+        self._records: dict[str, dict] = {}
+
+    def _put(self, record: dict):
+        hpid = record.get(HPID_KEY)
+        if hpid:
+            self._records[hpid] = record
+
+    def _load_base(self):
+        for r in _read_csv_records(self.csv_path):
+            self._put(r)
+
+    # 다른 워커가 journal에 추가한 레코드 반영
+    # 그 사이 다른 워커가 compact했으면 마지막 반영 이후 레코드는 CSV로 옮겨졌으므로 CSV부터 다시 읽음
+    def _sync_journal(self):
+        position = self._journal_position
+        if position is not None and position[0] != journal_generation(self.journal_path):
+            self._load_base()
+
+        records, self._journal_position = read_journal(self.journal_path, position)
+        for r in records:
+            self._put(r)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+
+        # CSV를 읽기 전의 세대를 기록 → 읽는 도중 compact되면 다음 반영 때 다시 읽음
+        self._journal_position = (journal_generation(self.journal_path), 0)
+        self._load_base()
+
+        self._sync_journal()
+        self._loaded = True
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._records)
+
+    def get(self, hpid: str, refresh: bool = False) -> dict | None:
+        with self._lock:
+            self._ensure_loaded()
+
+            if refresh and hpid not in self._records:
+                self._sync_journal()
+
+            return self._records.get(hpid)
+
+    # 여러 hpid를 한 번에 조회 (없는 hpid는 None)
+    # refresh면 없는 hpid가 있을 때 다른 워커가 추가한 journal을 1번 반영
+    def get_many(self, hpids, refresh: bool = False) -> list[dict | None]:
+        with self._lock:
+            self._ensure_loaded()
+
+            if refresh and any(h not in self._records for h in hpids):
+                self._sync_journal()
+
+            return [self._records.get(h) for h in hpids]
+
+    def put_many(self, records: list[dict]):
+        records = [r for r in records if r and r.get(HPID_KEY)]
+        if not records:
+            return
 
+        append_records(self.journal_path, records)
 
+        with self._lock:
+            self._ensure_loaded()
+            for r in records:
+                self._put(r)
+
+    def put(self, record: dict):
+        self.put_many([record])
+
+    # 전체 레코드를 DataFrame으로 (좌표 / 주소 기준점 등 일괄 처리용)
+    def frame(self) -> pd.DataFrame:
+        with self._lock:
+            self._ensure_loaded()
+            return pd.DataFrame(list(self._records.values()))
+
+    # journal 내용을 CSV에 합치고 journal 비우기 (atomic rename)
+    def compact(self):
+        with file_lock(self.journal_path):
+            merged = {}
+            for r in _read_csv_records(self.csv_path):
+                if r.get(HPID_KEY):
+                    merged[r[HPID_KEY]] = r
+
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            r = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        if r.get(HPID_KEY):
+                            merged[r[HPID_KEY]] = r
+
+            tmp_path = f"{self.csv_path}.{os.getpid()}.tmp"
+            os.makedirs(os.path.dirname(self.csv_path), exist_ok=True)
+            pd.DataFrame(list(merged.values())).to_csv(
+                tmp_path, index=False, encoding="utf-8-sig"
+            )
+            os.replace(tmp_path, self.csv_path)
+            rotate_journal(self.journal_path)
+
+        with self._lock:
+            self._journal_position = None
+
+
+static_store = StaticStore()
+
+
+# 전체 정적 정보 DataFrame
 def load_static_cache() -> pd.DataFrame:
-    if not os.path.exists(CSV_PATH):
-        return pd.DataFrame()
+    return static_store.frame()
+
+
+# 초당 호출 수 제한 (여러 스레드가 공유)
+class RateLimiter:
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+
+        if start_at > now:
+            time.sleep(start_at - now)
 
+
+# 재시도 (지수 backoff + jitter), 끝까지 실패하면 마지막 예외를 다시 발생
+def fetch_with_retry(hpid: str, limiter: RateLimiter, retries: int) -> dict | None:
+    for attempt in range(retries + 1):
+        limiter.wait()
+        try:
+            return fetch_hospital_static_by_hpid(hpid)
+        except Exception:
+            if attempt == retries:
+                raise
+            delay = RETRY_BASE_DELAY_SEC * (2 ** attempt)
+            time.sleep(delay * random.uniform(0.5, 1.5))
+
+
+# hpid 목록의 정적 정보를 동시에 조회 (동시 호출 수 / 초당 호출 수 제한)
+# → (레코드 목록, 정보 없는 hpid, 실패 hpid)
+def fetch_static_records(
+    hpids: list[str],
+    concurrency: int = STATIC_FETCH_CONCURRENCY,
+    rate_per_sec: float = STATIC_FETCH_RATE_PER_SEC,
+    retries: int = STATIC_FETCH_RETRIES
+) -> tuple[list[dict], list[str], list[str]]:
+
+    if not hpids:
+        return [], [], []
+
+    limiter = RateLimiter(rate_per_sec)
+    records, missing, failed = [], [], []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(hpids)))) as executor:
+        futures = [
+            executor.submit(fetch_with_retry, hpid, limiter, retries)
+            for hpid in hpids
+        ]
+
+        for hpid, future in zip(hpids, futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                print(f"[WARN] Failed to fetch static info for {hpid}: {e}")
+                failed.append(hpid)
+                continue
+
+            if record is None:
+                missing.append(hpid)
+                continue
+
+            record.setdefault(HPID_KEY, hpid)
+            records.append(record)
+
+    return records, missing, failed
+
+
+# 백그라운드 채우기: 요청 경로에서는 저장된 정보만 쓰고 없는 hpid는 여기서 조회
+# (다음 스냅샷 갱신부터 반영)
+_fill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="static-fill")
+_fill_lock = threading.Lock()
+_fill_pending: set[str] = set()
+# API에 정보가 없는 hpid (프로세스가 살아있는 동안 다시 조회하지 않음)
+_fill_no_info: set[str] = set()
+
+
+def _fill_static_info(hpids: list[str]):
     try:
-        df = pd.read_csv(CSV_PATH)
-    except Exception:
-        return pd.DataFrame()
+        records, missing, _ = fetch_static_records(hpids)
+        static_store.put_many(records)
+        with _fill_lock:
+            _fill_no_info.update(missing)
+    except Exception as e:
+        print(f"[WARN] Background static info fetch failed: {e}")
+    finally:
+        with _fill_lock:
+            _fill_pending.difference_update(hpids)
+
 
-    return df
+def schedule_static_fetch(hpids) -> int:
+    with _fill_lock:
+        targets = [
+            h for h in dict.fromkeys(hpids)
+            if h not in _fill_pending and h not in _fill_no_info
+        ]
+        _fill_pending.update(targets)
 
+    if targets:
+        _fill_executor.submit(_fill_static_info, targets)
 
-def save_static_cache(df: pd.DataFrame):
-    os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
-    df.to_csv(CSV_PATH, index=False, encoding="utf-8-sig")
+    return len(targets)
 
 
-def get_static_info_by_hpid(
-    hpid: str,
-    static_df: pd.DataFrame
-) -> tuple[dict | None, pd.DataFrame]:
+# 여러 hpid를 한 번에 조회 → 저장소에 없는 hpid는
+# - defer_missing=False: 동시에 API 조회 후 1번에 저장 (결과에 포함)
+# - defer_missing=True: 백그라운드 조회만 예약하고 None
+def get_static_info_many(hpids, defer_missing: bool = False) -> list[dict | None]:
+    hpids = list(hpids)
+    found = static_store.get_many(hpids, refresh=True)
 
-    if not static_df.empty and "total_hpid" in static_df.columns:
-        hit = static_df[static_df["total_hpid"] == hpid]
-        if not hit.empty:
-            return hit.iloc[0].to_dict(), static_df
+    missing = list(dict.fromkeys(
+        hpid for hpid, info in zip(hpids, found) if info is None
+    ))
+    if not missing:
+        return found
 
-    # CSV에 없으면 → API 호출
-    static_info = fetch_hospital_static_by_hpid(hpid)
-    if static_info is None:
-        return None, static_df
+    if defer_missing:
+        schedule_static_fetch(missing)
+        return found
 
-    # CSV에 누적 저장
-    new_df = pd.DataFrame([static_info])
-    updated_df = (
-        pd.concat([static_df, new_df], ignore_index=True)
-        if not static_df.empty
-        else new_df
-    )
+    records, _, _ = fetch_static_records(missing)
+    static_store.put_many(records)
 
-    save_static_cache(updated_df)
+    fetched = {r[HPID_KEY]: r for r in records}
 
-    return static_info, updated_df
\ No newline at end of file
+    return [
+        info if info is not None else fetched.get(hpid)
+        for hpid, info in zip(hpids, found)
+    ]
\ No newline at end of file
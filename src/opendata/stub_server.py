@@ -0,0 +1,96 @@
+"""
+공공데이터 API 대신 녹화된 XML 응답을 돌려주는 로컬 대역 서버.
+API_URL / STATIC_API_URL을 이 서버 주소로 지정하면
+스냅샷 갱신(poller)과 검색 경로를 네트워크 없이 확인할 수 있음.
+
+파일 이름 규칙 (요청 경로의 마지막 세그먼트 = operation):
+  {operation}_{STAGE1}_{STAGE2}_p{pageNo}.xml
+  {operation}_{STAGE1}_p{pageNo}.xml
+  {operation}_{HPID}.xml
+  {operation}.xml
+위에서부터 먼저 존재하는 파일을 응답함.
+
+실행 예:
+  python -m src.opendata.stub_server --dir data/recorded --port 8099
+  API_URL=http://127.0.0.1:8099/getEmrrmRltmUsefulSckbdInfoInqire
+"""
+
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def candidate_files(operation: str, query: dict) -> list[str]:
+    q = {k: v[0] for k, v in query.items() if v}
+
+    stage1 = q.get("STAGE1")
+    stage2 = q.get("STAGE2")
+    hpid = q.get("HPID")
+    page = q.get("pageNo", "1")
+
+    names = []
+    if stage1 and stage2:
+        names.append(f"{operation}_{stage1}_{stage2}_p{page}.xml")
+    if stage1:
+        names.append(f"{operation}_{stage1}_p{page}.xml")
+    if hpid:
+        names.append(f"{operation}_{hpid}.xml")
+    names.append(f"{operation}.xml")
+
+    return names
+
+
+def make_handler(record_dir: str):
+
+    class RecordedXMLHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            operation = url.path.rstrip("/").rsplit("/", 1)[-1]
+
+            for name in candidate_files(operation, parse_qs(url.query)):
+                path = os.path.join(record_dir, name)
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        body = f.read()
+
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/xml; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+            self.send_error(404, f"No recorded response for {self.path}")
+
+        def log_message(self, format, *args):
+            pass
+
+    return RecordedXMLHandler
+
+
+# 테스트 코드에서 백그라운드로 띄울 때 사용 (port=0이면 빈 포트 자동 할당)
+def start_stub_server(
+    record_dir: str,
+    host: str = "127.0.0.1",
+    port: int = 0
+) -> ThreadingHTTPServer:
+
+    server = ThreadingHTTPServer((host, port), make_handler(record_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.dir))
+    print(f"stub server: http://{args.host}:{args.port}  (dir={args.dir})")
+    server.serve_forever()
\ No newline at end of file
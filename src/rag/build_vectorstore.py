@@ -11,6 +11,8 @@ from langchain_huggingface import HuggingFaceEmbeddings
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 GUIDE_DIR = os.path.join(PROJECT_ROOT, "data", "guide")
 VECTOR_DB_DIR = os.path.join(PROJECT_ROOT, "data", "vectorstore")
+# 카테고리별 하위 인덱스 (예: data/vectorstore/categories/TRAUMA)
+CATEGORY_DB_DIR = os.path.join(VECTOR_DB_DIR, "categories")
 
 CATEGORY_RE = re.compile(r"\[CATEGORY\]\s*\n\s*([A-Z_]+)", re.MULTILINE)
 
@@ -63,9 +65,15 @@ def build_vectorstore():
         model_name="sentence-transformers/all-MiniLM-L6-v2"
     )
 
-    vectorstore = FAISS.from_documents(
-        documents=chunks,
-        embedding=embeddings
+    # 청크 임베딩은 1번만 계산해서 전체 인덱스 / 카테고리 인덱스에 함께 사용
+    texts = [c.page_content for c in chunks]
+    metadatas = [c.metadata for c in chunks]
+    vectors = embeddings.embed_documents(texts)
+
+    vectorstore = FAISS.from_embeddings(
+        text_embeddings=list(zip(texts, vectors)),
+        embedding=embeddings,
+        metadatas=metadatas
     )
 
     if os.path.exists(VECTOR_DB_DIR):
@@ -75,6 +83,20 @@ def build_vectorstore():
     vectorstore.save_local(VECTOR_DB_DIR)
     print("✅ HuggingFace + FAISS VectorStore 생성 완료")
 
+    # 카테고리별 하위 인덱스
+    by_category = {}
+    for text, vector, meta in zip(texts, vectors, metadatas):
+        by_category.setdefault(meta["category"], []).append((text, vector, meta))
+
+    for category, items in by_category.items():
+        category_store = FAISS.from_embeddings(
+            text_embeddings=[(text, vector) for text, vector, _ in items],
+            embedding=embeddings,
+            metadatas=[meta for _, _, meta in items]
+        )
+        category_store.save_local(os.path.join(CATEGORY_DB_DIR, category))
+        print(f"  📁 {category}: {len(items)} chunks")
+
 
 if __name__ == "__main__":
     build_vectorstore()
\ No newline at end of file
@@ -1,9 +1,8 @@
 import json
 from dotenv import load_dotenv
 from openai import OpenAI
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
-import os
+
+from src.rag.retriever import search_guides
 
 load_dotenv()
 
@@ -20,11 +19,6 @@ client = OpenAI(
 MODEL_NAME = "models/gemma-3-4b-it"
 
 
-# 경로
-PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
-VECTOR_DB_DIR = os.path.join(PROJECT_ROOT, "data", "vectorstore")
-
-
 # SYSTEM PROMPT
 SYSTEM_PROMPT = """
 너는 의료 진단이나 치료를 하지 않는다.
@@ -97,22 +91,8 @@ def generate_emergency_guidance(
     condition: str,
     top_k: int = 5
 ) -> dict:
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
-
-    vectorstore = FAISS.load_local(
-        VECTOR_DB_DIR,
-        embeddings,
-        allow_dangerous_deserialization=True
-    )
-
-    docs = vectorstore.similarity_search(query, k=top_k * 5)
-
-    if condition:
-        docs = [d for d in docs if d.metadata.get("category") == condition]
-
-    docs = docs[:top_k]
+    # 질환 카테고리 인덱스에서만 검색 (프로세스 전역 retriever)
+    docs = search_guides(query, condition, k=top_k)
 
     if not docs:
         return {
@@ -0,0 +1,129 @@
+import os
+import threading
+
+from langchain_community.vectorstores import FAISS
+from langchain_huggingface import HuggingFaceEmbeddings
+
+# 경로
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+VECTOR_DB_DIR = os.path.join(PROJECT_ROOT, "data", "vectorstore")
+CATEGORY_DB_DIR = os.path.join(VECTOR_DB_DIR, "categories")
+
+FALLBACK_CATEGORY = "UNKNOWN"
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# 임베딩 모델 / FAISS 인덱스는 프로세스당 1번만 로드해서 모든 요청·스레드가 공유
+_embeddings = None
+_vectorstore = None
+_category_stores: dict[str, FAISS] | None = None
+_load_lock = threading.Lock()
+# 카테고리 인덱스 로드는 get_embeddings / get_vectorstore(_load_lock)를 호출하므로 별도 잠금
+_category_lock = threading.Lock()
+_ready = threading.Event()
+
+
+def get_embeddings() -> HuggingFaceEmbeddings:
+    global _embeddings
+
+    if _embeddings is None:
+        with _load_lock:
+            if _embeddings is None:
+                _embeddings = HuggingFaceEmbeddings(
+                    model_name=EMBEDDING_MODEL_NAME
+                )
+
+    return _embeddings
+
+
+def get_vectorstore() -> FAISS:
+    global _vectorstore
+
+    if _vectorstore is None:
+        embeddings = get_embeddings()
+
+        with _load_lock:
+            if _vectorstore is None:
+                _vectorstore = FAISS.load_local(
+                    VECTOR_DB_DIR,
+                    embeddings,
+                    allow_dangerous_deserialization=True
+                )
+
+    return _vectorstore
+
+
+# 전체 인덱스를 카테고리별로 나눔 (저장된 벡터를 재사용, 재임베딩 없음)
+# build_vectorstore로 카테고리 인덱스를 만들기 전의 인덱스용
+def split_by_category(vectorstore: FAISS) -> dict[str, FAISS]:
+    grouped = {}
+
+    for i, doc_id in vectorstore.index_to_docstore_id.items():
+        doc = vectorstore.docstore.search(doc_id)
+        category = (doc.metadata or {}).get("category", FALLBACK_CATEGORY)
+        vector = vectorstore.index.reconstruct(int(i))
+        grouped.setdefault(category, []).append((doc, vector))
+
+    return {
+        category: FAISS.from_embeddings(
+            text_embeddings=[(doc.page_content, vector) for doc, vector in items],
+            embedding=vectorstore.embeddings,
+            metadatas=[doc.metadata for doc, _ in items]
+        )
+        for category, items in grouped.items()
+    }
+
+
+def load_category_stores() -> dict[str, FAISS]:
+    embeddings = get_embeddings()
+
+    if os.path.isdir(CATEGORY_DB_DIR):
+        return {
+            category: FAISS.load_local(
+                os.path.join(CATEGORY_DB_DIR, category),
+                embeddings,
+                allow_dangerous_deserialization=True
+            )
+            for category in sorted(os.listdir(CATEGORY_DB_DIR))
+            if os.path.isdir(os.path.join(CATEGORY_DB_DIR, category))
+        }
+
+    return split_by_category(get_vectorstore())
+
+
+def get_category_vectorstore(category: str) -> FAISS | None:
+    global _category_stores
+
+    # 동시에 들어온 첫 요청들이 각자 인덱스를 만들지 않도록 잠금 안에서 1번만 로드
+    if _category_stores is None:
+        with _category_lock:
+            if _category_stores is None:
+                _category_stores = load_category_stores()
+
+    return _category_stores.get(category)
+
+
+# 질환 카테고리 인덱스에서만 검색 (없으면 UNKNOWN 인덱스, 카테고리가 없으면 전체 인덱스)
+def search_guides(query: str, condition: str | None, k: int = 5) -> list:
+    if not condition:
+        return get_vectorstore().similarity_search(query, k=k)
+
+    vectorstore = get_category_vectorstore(condition)
+    if vectorstore is None:
+        vectorstore = get_category_vectorstore(FALLBACK_CATEGORY)
+    if vectorstore is None:
+        return []
+
+    return vectorstore.similarity_search(query, k=k)
+
+
+# 서버 시작 시 호출: 모델/인덱스 로드 + 더미 검색 1회로 첫 요청 지연 제거
+def warmup_retriever():
+    vectorstore = get_vectorstore()
+    vectorstore.similarity_search("응급", k=1)
+    get_category_vectorstore(FALLBACK_CATEGORY)
+    _ready.set()
+
+
+def is_retriever_ready() -> bool:
+    return _ready.is_set()
\ No newline at end of file
@@ -0,0 +1,176 @@
+import json
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 동작 (단일 워커 가정)
+    fcntl = None
+
+
+# 여러 uvicorn 워커가 같은 파일을 쓸 때를 위한 프로세스 간 잠금
+@contextmanager
+def file_lock(path: str, exclusive: bool = True):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# JSON Lines 파일 끝에 레코드 추가 (기존 내용은 다시 쓰지 않음)
+def append_records(path: str, records: list[dict]):
+    if not records:
+        return
+
+    data = "".join(
+        json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for r in records
+    ).encode("utf-8")
+
+    with file_lock(path):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+def _parse_lines(data: bytes) -> tuple[list[dict], int]:
+    # 마지막 줄이 아직 완성되지 않았으면 다음 읽기로 미룸
+    end = data.rfind(b"\n") + 1
+    records = []
+
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+
+    return records, end
+
+
+# offset 이후에 추가된 레코드만 읽음 → (레코드 목록, 새 offset)
+# 파일이 compact되어 offset보다 작아졌으면 처음부터 다시 읽음
+def read_records(path: str, offset: int = 0) -> tuple[list[dict], int]:
+    if not os.path.exists(path):
+        return [], 0
+
+    with file_lock(path, exclusive=False):
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < offset:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+
+    records, end = _parse_lines(data)
+    return records, offset + end
+
+
+# journal 세대 번호 (compact 등으로 파일이 교체될 때마다 증가, 별도 파일에 저장)
+# inode는 삭제 직후 새 파일에 재사용될 수 있어서 교체 여부 판단에 쓰지 않음
+def journal_generation(path: str) -> int:
+    try:
+        with open(path + ".gen", "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return 0
+
+
+def _bump_generation(path: str):
+    gen_path = path + ".gen"
+    tmp_path = f"{gen_path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(str(journal_generation(path) + 1))
+
+    os.replace(tmp_path, gen_path)
+
+
+# journal 삭제 + 세대 증가 (호출하는 쪽에서 file_lock(path)을 잡고 있어야 함)
+def rotate_journal(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    _bump_generation(path)
+
+
+# 여러 워커가 공유하는 journal을 이어서 읽음 → (레코드 목록, 새 위치)
+# 위치는 (세대, offset): 다른 워커가 파일을 교체했으면 크기와 상관없이 처음부터 다시 읽음
+# (None이면 처음부터)
+def read_journal(path: str, position: tuple | None = None) -> tuple[list[dict], tuple | None]:
+    with file_lock(path, exclusive=False):
+        generation = journal_generation(path)
+
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return [], (generation, 0)
+
+        with f:
+            offset = 0
+            if position is not None and position[0] == generation:
+                offset = position[1]
+
+            f.seek(0, os.SEEK_END)
+            if f.tell() < offset:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+
+    records, end = _parse_lines(data)
+    return records, (generation, offset + end)
+
+
+# 조건에 맞는 레코드만 남기고 파일을 통째로 교체 (보존 기간 정리 등) → 남은 레코드 수
+def rewrite_records(path: str, keep) -> int:
+    if not os.path.exists(path):
+        return 0
+
+    with file_lock(path):
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+
+        kept = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kept.append(record)
+
+        kept = keep(kept)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for r in kept:
+                f.write(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+        _bump_generation(path)
+
+    return len(kept)
+
+
+# 임시 파일에 쓴 뒤 rename으로 교체 (읽는 쪽은 항상 완전한 파일만 봄)
+def atomic_write_json(path: str, obj):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
\ No newline at end of file
@@ -1,13 +1,138 @@
-import requests
+import asyncio
+import os
+import threading
+
+import numpy as np
 from dotenv import load_dotenv
-from config import KAKAO_REST_API_KEY
+from config import KAKAO_REST_API_KEY, REGION_LOOKUP_ONLINE
+
+from src.hospital.distance import haversine_distance_np
+from src.opendata.static_cache import load_static_cache
+from src.utils.append_log import append_records, read_records
+from src.utils.http_client import http_get, http_get_async
 
 # 환경 변수 로드
 load_dotenv()
-def latlon_to_region(lat: float, lon: float) -> tuple[str, str]:
 
-    # 위도/경도를 시/구로 변환 (예: 서울특별시, 강남구)
-    url = "https://dapi.kakao.com/v2/local/geo/coord2regioncode.json"
+KAKAO_REGION_URL = "https://dapi.kakao.com/v2/local/geo/coord2regioncode.json"
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+GRID_CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "region_grid_cache.jsonl")
+
+# 격자 크기 (약 0.005도 ≈ 위도 550m × 경도 440m)
+GRID_CELL_DEG = 0.005
+
+# 오프라인 추정 시 가장 가까운 기준점이 이 거리보다 멀면 실패로 처리
+OFFLINE_MAX_DISTANCE_KM = 5.0
+
+
+def grid_cell(lat: float, lon: float) -> str:
+    return f"{int(np.floor(lat / GRID_CELL_DEG))}:{int(np.floor(lon / GRID_CELL_DEG))}"
+
+
+# 격자 셀 → (시, 구) 캐시 + 오프라인 추정용 기준점(좌표, 시, 구)
+class RegionGrid:
+
+    def __init__(self, path: str = GRID_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._offset = 0
+
+        self._cells: dict[str, tuple[str, str]] = {}
+        self._points: list[tuple[float, float, str, str]] = []
+        self._point_arrays = None
+
+    def _add(self, r: dict):
+        region = (r["city"], r["district"])
+        self._cells[r["cell"]] = region
+        self._points.append((r["lat"], r["lon"], *region))
+        self._point_arrays = None
+
+    def _sync(self):
+        records, self._offset = read_records(self.path, self._offset)
+        for r in records:
+            self._add(r)
+
+    # 정적 병원 정보의 좌표/주소도 기준점으로 사용
+    def _load_hospital_points(self):
+        static_df = load_static_cache()
+        cols = ["total_wgs84lat", "total_wgs84lon", "total_dutyaddr"]
+
+        if static_df.empty or not set(cols).issubset(static_df.columns):
+            return
+
+        for lat, lon, addr in static_df[cols].itertuples(index=False):
+            parts = addr.split() if isinstance(addr, str) else []
+            try:
+                lat, lon = float(lat), float(lon)
+            except (TypeError, ValueError):
+                continue
+            if len(parts) < 2 or np.isnan(lat) or np.isnan(lon):
+                continue
+            self._points.append((lat, lon, parts[0], parts[1]))
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._load_hospital_points()
+        self._sync()
+        self._loaded = True
+
+    def get(self, lat: float, lon: float) -> tuple[str, str] | None:
+        cell = grid_cell(lat, lon)
+
+        with self._lock:
+            self._ensure_loaded()
+            region = self._cells.get(cell)
+            if region is None:
+                self._sync()
+                region = self._cells.get(cell)
+            return region
+
+    def put(self, lat: float, lon: float, region: tuple[str, str]):
+        record = {
+            "cell": grid_cell(lat, lon),
+            "lat": lat,
+            "lon": lon,
+            "city": region[0],
+            "district": region[1],
+        }
+        append_records(self.path, [record])
+
+        with self._lock:
+            self._ensure_loaded()
+            self._add(record)
+
+    # 네트워크 없이: 가장 가까운 기준점의 시/구로 추정
+    def nearest(self, lat: float, lon: float) -> tuple[str, str] | None:
+        with self._lock:
+            self._ensure_loaded()
+
+            if not self._points:
+                return None
+
+            if self._point_arrays is None:
+                self._point_arrays = np.array(
+                    [(p[0], p[1]) for p in self._points], dtype=float
+                )
+            points = self._point_arrays
+            regions = list(self._points)
+
+        dist = haversine_distance_np(lat, lon, points[:, 0], points[:, 1])
+        i = int(np.argmin(dist))
+
+        if dist[i] > OFFLINE_MAX_DISTANCE_KM:
+            return None
+
+        return regions[i][2], regions[i][3]
+
+
+region_grid = RegionGrid()
+
+
+# 카카오 좌표 → 행정구역 API
+def kakao_region_request(lat: float, lon: float) -> tuple[dict, dict]:
     headers = {
         "Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"
     }
@@ -15,11 +140,76 @@ def latlon_to_region(lat: float, lon: float) -> tuple[str, str]:
         "x": lon,
         "y": lat
     }
+    return headers, params
+
 
-    res = requests.get(url, headers=headers, params=params).json()
-    region = res["documents"][0]
+def parse_kakao_region(data: dict) -> tuple[str, str]:
+    region = data["documents"][0]
 
     city = region["region_1depth_name"]
     district = region["region_2depth_name"]
 
-    return city, district
\ No newline at end of file
+    return city, district
+
+
+def fetch_region_from_kakao(lat: float, lon: float) -> tuple[str, str]:
+    headers, params = kakao_region_request(lat, lon)
+
+    res = http_get(KAKAO_REGION_URL, headers=headers, params=params, timeout=3)
+
+    return parse_kakao_region(res.json())
+
+
+async def fetch_region_from_kakao_async(lat: float, lon: float) -> tuple[str, str]:
+    headers, params = kakao_region_request(lat, lon)
+
+    res = await http_get_async(KAKAO_REGION_URL, headers=headers, params=params, timeout=3)
+
+    return parse_kakao_region(res.json())
+
+
+def latlon_to_region(lat: float, lon: float) -> tuple[str, str]:
+
+    # 위도/경도를 시/구로 변환 (예: 서울특별시, 강남구)
+    # 1. 격자 캐시 (이전에 조회한 셀이면 네트워크 없이 반환)
+    region = region_grid.get(lat, lon)
+    if region:
+        return region
+
+    # 2. 카카오 API (결과를 격자 캐시에 저장)
+    if REGION_LOOKUP_ONLINE:
+        try:
+            region = fetch_region_from_kakao(lat, lon)
+            region_grid.put(lat, lon, region)
+            return region
+        except Exception as e:
+            print(f"[WARN] Kakao region lookup failed, using offline estimate: {e}")
+
+    # 3. 오프라인 추정 (가장 가까운 기준점)
+    region = region_grid.nearest(lat, lon)
+    if region is None:
+        raise RuntimeError(f"Failed to resolve region for ({lat}, {lon})")
+
+    return region
+
+
+# latlon_to_region의 비동기 버전 (카카오 호출만 비동기, 캐시/추정은 동일)
+# 격자 캐시는 파일 I/O(journal + 잠금, 첫 사용 시 정적 정보 CSV 로드)라서 워커 스레드에서
+async def latlon_to_region_async(lat: float, lon: float) -> tuple[str, str]:
+    region = await asyncio.to_thread(region_grid.get, lat, lon)
+    if region:
+        return region
+
+    if REGION_LOOKUP_ONLINE:
+        try:
+            region = await fetch_region_from_kakao_async(lat, lon)
+            await asyncio.to_thread(region_grid.put, lat, lon, region)
+            return region
+        except Exception as e:
+            print(f"[WARN] Kakao region lookup failed, using offline estimate: {e}")
+
+    region = await asyncio.to_thread(region_grid.nearest, lat, lon)
+    if region is None:
+        raise RuntimeError(f"Failed to resolve region for ({lat}, {lon})")
+
+    return region
\ No newline at end of file
@@ -0,0 +1,241 @@
+# 외부 HTTP 호출 공통 모듈 (공공 API / 카카오)
+# - 동기: 프로세스 전역 requests.Session (keep-alive, 호스트별 연결 수 제한)
+# - 비동기: 이벤트 루프별 httpx.AsyncClient
+# - 타임아웃, jitter를 준 재시도, 선택적 hedged request (느린 응답이면 같은 요청을 한 번 더)
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    HTTP_CONNECT_TIMEOUT_SEC,
+    HTTP_MAX_PER_HOST,
+    HTTP_READ_TIMEOUT_SEC,
+    HTTP_RETRIES,
+)
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RETRY_BASE_DELAY_SEC = 0.2
+RETRY_MAX_DELAY_SEC = 2.0
+
+# 캐시해 둘 호스트별 연결 풀 개수
+POOL_CONNECTIONS = 8
+HEDGE_WORKERS = 32
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_hedge_executor: ThreadPoolExecutor | None = None
+
+_async_client: httpx.AsyncClient | None = None
+_async_loop: asyncio.AbstractEventLoop | None = None
+_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def default_timeout() -> tuple[float, float]:
+    return HTTP_CONNECT_TIMEOUT_SEC, HTTP_READ_TIMEOUT_SEC
+
+
+# attempt번째 재시도 전 대기 시간 (지수 증가 + jitter)
+def backoff_delay(attempt: int) -> float:
+    delay = min(RETRY_MAX_DELAY_SEC, RETRY_BASE_DELAY_SEC * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.5)
+
+
+# 동기
+
+def get_session() -> requests.Session:
+    global _session, _hedge_executor
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # pool_block: 호스트별 연결이 HTTP_MAX_PER_HOST개를 넘으면 대기
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_MAX_PER_HOST,
+                    pool_block=True,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=HEDGE_WORKERS,
+                    thread_name_prefix="http-hedge"
+                )
+                _session = session
+
+    return _session
+
+
+# 첫 요청이 hedge_after초 안에 끝나지 않으면 같은 요청을 하나 더 보내고 먼저 성공한 응답 사용
+def _hedged(send, hedge_after: float):
+    first = _hedge_executor.submit(send)
+    done, _ = wait([first], timeout=hedge_after)
+    if done:
+        return first.result()
+
+    pending = {first, _hedge_executor.submit(send)}
+    error = None
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+
+    raise error
+
+
+def http_get(
+    url: str,
+    *,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    retries: int = HTTP_RETRIES,
+    hedge_after: float | None = None
+) -> requests.Response:
+
+    session = get_session()
+    timeout = timeout or default_timeout()
+
+    def send():
+        return session.get(url, params=params, headers=headers, timeout=timeout)
+
+    for attempt in range(retries + 1):
+        try:
+            response = _hedged(send, hedge_after) if hedge_after else send()
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS or attempt == retries:
+                response.raise_for_status()
+                return response
+
+        time.sleep(backoff_delay(attempt))
+
+
+# 비동기
+
+# 이벤트 루프마다 클라이언트 1개 (다른 루프에서 만든 연결은 재사용할 수 없음)
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client, _async_loop, _host_semaphores
+
+    loop = asyncio.get_running_loop()
+
+    if _async_client is None or _async_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT_SEC, connect=HTTP_CONNECT_TIMEOUT_SEC),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_PER_HOST * POOL_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_PER_HOST * POOL_CONNECTIONS,
+            ),
+        )
+        _async_loop = loop
+        _host_semaphores = {}
+
+    return _async_client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(HTTP_MAX_PER_HOST)
+    return _host_semaphores[host]
+
+
+def _async_timeout(timeout) -> httpx.Timeout | None:
+    if timeout is None:
+        return None
+    if isinstance(timeout, tuple):
+        return httpx.Timeout(timeout[1], connect=timeout[0])
+    return httpx.Timeout(timeout)
+
+
+async def _hedged_async(send, hedge_after: float):
+    first = asyncio.ensure_future(send())
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done:
+        return first.result()
+
+    pending = {first, asyncio.ensure_future(send())}
+    error = None
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def http_get_async(
+    url: str,
+    *,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    retries: int = HTTP_RETRIES,
+    hedge_after: float | None = None
+) -> httpx.Response:
+
+    client = get_async_client()
+    semaphore = _host_semaphore(url)
+    request_timeout = _async_timeout(timeout)
+
+    async def send():
+        async with semaphore:
+            if request_timeout is None:
+                return await client.get(url, params=params, headers=headers)
+            return await client.get(url, params=params, headers=headers, timeout=request_timeout)
+
+    for attempt in range(retries + 1):
+        try:
+            response = await (_hedged_async(send, hedge_after) if hedge_after else send())
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS or attempt == retries:
+                response.raise_for_status()
+                return response
+
+        await asyncio.sleep(backoff_delay(attempt))
+
+
+# 서버 종료 시 호출
+async def close_http_clients():
+    global _async_client, _async_loop, _session, _hedge_executor
+
+    if _async_client is not None and _async_loop is asyncio.get_running_loop():
+        await _async_client.aclose()
+    _async_client = None
+    _async_loop = None
+
+    # 이후 get_session()이 닫힌 세션을 돌려주지 않도록 초기화
+    with _session_lock:
+        session, executor = _session, _hedge_executor
+        _session = None
+        _hedge_executor = None
+
+    if session is not None:
+        session.close()
+    if executor is not None:
+        executor.shutdown(wait=False)
\ No newline at end of file